@@ -0,0 +1,95 @@
+from scripts.utils.dates import parse_dates, format_dates
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import warnings
+import time
+
+#```
+# Compares scripts/utils/dates.py against plain pd.to_datetime(...).dt.strftime on date columns shaped
+# like the project's CSVs: a long ticker panel repeats each date once per ticker, so only a few
+# thousand of the strings are distinct.
+# The same comparison then runs on the date columns of the real CSVs in REAL_DIRS: per file (as the
+# cleanup scripts parse them) and stacked into one column (as the merge sees them).
+# run from root: python3 -m scripts.benchmarks.bench_dates
+#```
+
+# ========= EDIT THESE =========
+N_TICKERS = 100
+N_DAYS = 6500        # ~25 years of trading days
+BAD_SHARE = 0.001    # share of unparsable cells ("n/a", "")
+REPEAT = 3
+SEED = 42
+REAL_DIRS = ["data/fred", "data/indicators"]
+DATE_CANDIDATES = ["observation_date", "Date", "date"]
+MAX_FILES = None     # sample of the first N files per directory (None = all)
+# ==============================
+
+def make_columns(n_tickers, n_days, seed=SEED):
+    rng = np.random.default_rng(seed)
+    days = pd.bdate_range("2000-01-03", periods=n_days)
+    cols = {}
+    for label, fmt in [("iso", "%Y-%m-%d"), ("timestamp", "%Y-%m-%d %H:%M:%S"), ("us", "%m/%d/%Y")]:
+        text = np.tile(days.strftime(fmt).to_numpy(dtype=object), n_tickers)
+        bad = rng.random(len(text)) < BAD_SHARE
+        text[bad] = rng.choice(["n/a", ""], size=bad.sum())
+        text[0] = days[0].strftime(fmt)  # both parsers detect the format from the first value
+        cols[label] = pd.Series(text, name="date")
+    return cols
+
+def read_date_columns(directory, max_files=MAX_FILES):
+    # The date column of every CSV in directory, as the raw strings
+    cols = []
+    for fp in sorted(Path(directory).glob("*.csv"))[:max_files]:
+        header = pd.read_csv(fp, nrows=0).columns
+        date_col = next((c for c in DATE_CANDIDATES if c in header), None)
+        if date_col is not None:
+            cols.append(pd.read_csv(fp, usecols=[date_col], dtype=str, keep_default_na=False)[date_col])
+    return cols
+
+def legacy(s):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        parsed = pd.to_datetime(s, errors="coerce", utc=False)
+    return parsed, parsed.dt.strftime("%Y-%m-%d")
+
+def cached(s):
+    parsed = parse_dates(s)
+    return parsed, format_dates(parsed)
+
+def best_of(fn, s):
+    best, out = float("inf"), None
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        out = fn(s)
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+def compare(s):
+    # (to_datetime seconds, cached seconds); raises when the results differ
+    t_legacy, (p_legacy, f_legacy) = best_of(legacy, s)
+    t_cached, (p_cached, f_cached) = best_of(cached, s)
+    pd.testing.assert_series_equal(p_legacy, p_cached)
+    pd.testing.assert_series_equal(f_legacy, f_cached)
+    return t_legacy, t_cached
+
+def report(label, rows, distinct, t_legacy, t_cached):
+    print(f"[OK]  {label:<26} {rows} rows, {distinct} distinct, identical "
+          f"| to_datetime: {t_legacy:.3f}s  cached: {t_cached:.3f}s  speedup: {t_legacy / t_cached:.1f}x")
+
+def main():
+    for label, s in make_columns(N_TICKERS, N_DAYS).items():
+        report(label, len(s), s.nunique(), *compare(s))
+
+    for directory in REAL_DIRS:
+        cols = read_date_columns(directory)
+        if not cols:
+            print(f"[SKIP] No date columns in {directory}")
+            continue
+        times = np.array([compare(s) for s in cols]).sum(axis=0)
+        stacked = pd.concat(cols, ignore_index=True)
+        report(f"{directory} ({len(cols)} files)", len(stacked), stacked.nunique(), *times)
+        report(f"{directory} stacked", len(stacked), stacked.nunique(), *compare(stacked))
+
+if __name__ == "__main__":
+    main()
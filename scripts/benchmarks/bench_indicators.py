@@ -0,0 +1,305 @@
+from scripts.get_Indicators.GetMajorIndicators_StandaloneScript import (
+    build_features, build_features_panel, FEATURE_COLUMNS,
+)
+from scripts.benchmarks.bench_streaming_features import make_ohlcv
+from pathlib import Path
+import tracemalloc
+import platform
+import numpy as np
+import pandas as pd
+import json
+import math
+import time
+import sys
+import os
+
+#```
+# Throughput, peak memory and parity of build_features, the path run_pipeline takes.
+# - every case runs build_features (the feature graph) for a few columns over N_TICKERS synthetic
+#   OHLCV series of N_DAYS bars (best of REPEAT runs); build_features/_panel run all of them
+# - parity: the first ticker is checked against plain numpy reference implementations below
+# - regressions: results are compared with BASELINE_PATH (slower or hungrier than the tolerance -> flagged)
+#   only when it was recorded with the same days/tickers on the same environment (CPU, python, numpy,
+#   pandas); otherwise the comparison is skipped with a warning. --save-baseline records this machine's.
+# run from root: python3 -m scripts.benchmarks.bench_indicators [--days N] [--tickers N] [--save-baseline]
+# exits with 1 when a parity check fails or a regression is flagged
+#```
+
+# ========= EDIT THESE =========
+N_DAYS = 6300                  # ~25 years of daily bars
+N_TICKERS = 28                 # size of the default TICKERS universe
+REPEAT = 3
+RTOL = 1e-9                    # pandas' online rolling kernels vs. naive window sums
+TIME_TOLERANCE = 0.25          # flag when >25% slower than the baseline ...
+MIN_SLOWDOWN_MS = 2.0          # ... and by more than this (millisecond cases are mostly timer noise)
+MEMORY_TOLERANCE = 0.10        # flag when peak memory grows >10%
+BASELINE_PATH = Path("scripts/benchmarks/indicators_baseline.json")
+# ==============================
+
+# -----------------------------
+# Reference implementations: direct loops over numpy arrays, written for clarity not speed
+# -----------------------------
+def ref_rolling(x, window, fn):
+    out = np.full(len(x), np.nan)
+    for i in range(window - 1, len(x)):
+        out[i] = fn(x[i - window + 1:i + 1])
+    return out
+
+def ref_ewm(x, alpha):
+    # adjust=False recursion; leading NaNs stay NaN, later NaNs repeat the last value
+    out = np.full(len(x), np.nan)
+    prev = np.nan
+    for i, v in enumerate(x):
+        if not np.isnan(v):
+            prev = v if np.isnan(prev) else (1 - alpha) * prev + alpha * v
+        out[i] = prev
+    return out
+
+def ref_diff(x):
+    return np.concatenate([[np.nan], np.diff(x)])
+
+def ref_prev(x):
+    return np.concatenate([[np.nan], x[:-1]])
+
+def ref_sma(c, w):
+    return ref_rolling(c, w, np.mean)
+
+def ref_ema(c, w):
+    return ref_ewm(c, 2 / (w + 1))
+
+def ref_wma(c, w):
+    weights = np.arange(1, w + 1, dtype=float)
+    return ref_rolling(c, w, lambda x: x @ weights / weights.sum())
+
+def ref_macd(c):
+    line = ref_ema(c, 12) - ref_ema(c, 26)
+    signal = ref_ema(line, 9)
+    return line, signal, line - signal
+
+def ref_rsi(c, p=14):
+    delta = ref_diff(c)
+    gain = ref_ewm(np.where(np.isnan(delta), np.nan, np.maximum(delta, 0)), 1 / p)
+    loss = ref_ewm(np.where(np.isnan(delta), np.nan, np.maximum(-delta, 0)), 1 / p)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 - 100 / (1 + gain / loss)
+
+def ref_stochastic(h, l, c, k_window=14, d_window=3):
+    hh, ll = ref_rolling(h, k_window, np.max), ref_rolling(l, k_window, np.min)
+    k = 100 * (c - ll) / (hh - ll)
+    return k, ref_rolling(k, d_window, np.mean)
+
+def ref_williams_r(h, l, c, p=14):
+    hh, ll = ref_rolling(h, p, np.max), ref_rolling(l, p, np.min)
+    return -100 * (hh - c) / (hh - ll)
+
+def ref_bollinger(c, w=20):
+    mid = ref_sma(c, w)
+    std = ref_rolling(c, w, lambda x: np.std(x, ddof=1))
+    upper, lower = mid + 2 * std, mid - 2 * std
+    return upper, mid, lower, (c - lower) / (upper - lower)
+
+def ref_true_range(h, l, c):
+    pc = ref_prev(c)
+    tr = h - l
+    tr[1:] = np.maximum.reduce([tr[1:], np.abs(h - pc)[1:], np.abs(l - pc)[1:]])
+    return tr
+
+def ref_atr(h, l, c, p=14):
+    return ref_ewm(ref_true_range(h, l, c), 1 / p)
+
+def ref_hist_vol(log_ret, w=20):
+    return ref_rolling(log_ret, w, lambda x: np.std(x, ddof=1)) * math.sqrt(252)
+
+def ref_obv(c, v):
+    out = np.zeros(len(c))
+    for i in range(1, len(c)):
+        out[i] = out[i - 1] + np.sign(c[i] - c[i - 1]) * v[i]
+    return out
+
+def ref_cmf(h, l, c, v, p=20):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mfm = ((c - l) - (h - c)) / (h - l)
+    mfm[~np.isfinite(mfm)] = 0
+    return ref_rolling(mfm * v, p, np.sum) / ref_rolling(v, p, np.sum)
+
+def ref_vwap(h, l, c, v, w=20):
+    return ref_rolling((h + l + c) / 3 * v, w, np.sum) / ref_rolling(v, w, np.sum)
+
+def reference_features(raw):
+    # build_features' columns from the reference implementations
+    o, h, l, c, v = (raw[k].to_numpy(dtype=float) for k in ('Open', 'High', 'Low', 'Close', 'Volume'))
+    pc = ref_prev(c)
+    ret_log = ref_diff(np.log(c))
+    f = {
+        'ret_pct': c / pc - 1, 'ret_log': ret_log,
+        'gap_open_prevclose': (o - pc) / pc, 'spread_hl': (h - l) / pc, 'spread_co': (c - o) / o,
+    }
+    for w in [10, 20, 50, 100, 200]:
+        f[f'sma_{w}'], f[f'ema_{w}'], f[f'wma_{w}'] = ref_sma(c, w), ref_ema(c, w), ref_wma(c, w)
+    f['macd'], f['macd_signal'], f['macd_hist'] = ref_macd(c)
+    f['rsi_14'] = ref_rsi(c)
+    f['stoch_k_14'], f['stoch_d_3'] = ref_stochastic(h, l, c)
+    f['williams_r_14'] = ref_williams_r(h, l, c)
+    f['bb_upper_20'], f['bb_mid_20'], f['bb_lower_20'], f['bbp_20'] = ref_bollinger(c)
+    f['atr_14'] = ref_atr(h, l, c)
+    f['hv_20'] = ref_hist_vol(ret_log)
+    f['obv'] = ref_obv(c, v)
+    f['cmf_20'] = ref_cmf(h, l, c, v)
+    f['vwap_20'] = ref_vwap(h, l, c, v)
+    return f
+
+# -----------------------------
+# Cases: name -> (run on one ticker's raw frame, reference on the same frame)
+# -----------------------------
+def _arrays(result):
+    if isinstance(result, tuple):
+        return [np.asarray(r, dtype=float) for r in result]
+    return [np.asarray(result, dtype=float)]
+
+def _np(raw, *cols):
+    return [raw[c].to_numpy(dtype=float) for c in cols]
+
+def _graph(*columns):
+    # build_features restricted to `columns`: the graph only evaluates them and their inputs
+    return lambda raw: tuple(build_features(raw, features=list(columns))[c] for c in columns)
+
+def _build_columns(raw):
+    out = build_features(raw)
+    return tuple(out[c] for c in FEATURE_COLUMNS)
+
+CASES = {
+    'sma_50': (_graph('sma_50'), lambda r: ref_sma(*_np(r, 'Close'), 50)),
+    'ema_50': (_graph('ema_50'), lambda r: ref_ema(*_np(r, 'Close'), 50)),
+    'wma_50': (_graph('wma_50'), lambda r: ref_wma(*_np(r, 'Close'), 50)),
+    'macd': (_graph('macd', 'macd_signal', 'macd_hist'), lambda r: ref_macd(*_np(r, 'Close'))),
+    'rsi_14': (_graph('rsi_14'), lambda r: ref_rsi(*_np(r, 'Close'))),
+    'stoch_14_3': (_graph('stoch_k_14', 'stoch_d_3'), lambda r: ref_stochastic(*_np(r, 'High', 'Low', 'Close'))),
+    'williams_r_14': (_graph('williams_r_14'), lambda r: ref_williams_r(*_np(r, 'High', 'Low', 'Close'))),
+    'bollinger_20': (_graph('bb_upper_20', 'bb_mid_20', 'bb_lower_20', 'bbp_20'),
+                     lambda r: ref_bollinger(*_np(r, 'Close'))),
+    'atr_14': (_graph('atr_14'), lambda r: ref_atr(*_np(r, 'High', 'Low', 'Close'))),
+    'hv_20': (_graph('hv_20'), lambda r: ref_hist_vol(ref_diff(np.log(*_np(r, 'Close'))))),
+    'obv': (_graph('obv'), lambda r: ref_obv(*_np(r, 'Close', 'Volume'))),
+    'cmf_20': (_graph('cmf_20'), lambda r: ref_cmf(*_np(r, 'High', 'Low', 'Close', 'Volume'))),
+    'vwap_20': (_graph('vwap_20'), lambda r: ref_vwap(*_np(r, 'High', 'Low', 'Close', 'Volume'))),
+    'build_features': (_build_columns, lambda r: tuple(reference_features(r).values())),
+}
+
+def check_parity(name, raw):
+    # Returns the worst mismatch (scaled to each output's magnitude); 0 means equal
+    worst = 0.0
+    fast, ref = CASES[name]
+    for got, want in zip(_arrays(fast(raw)), _arrays(ref(raw))):
+        want[~np.isfinite(want)] = np.nan
+        got = np.where(np.isfinite(got), got, np.nan)
+        if not np.array_equal(np.isnan(got), np.isnan(want)):
+            return math.inf
+        scale = np.nanmax(np.abs(want)) if np.isfinite(want).any() else 1.0
+        worst = max(worst, float(np.nanmax(np.abs(got - want), initial=0.0) / max(scale, 1e-300)))
+    return worst
+
+# -----------------------------
+# Measurements
+# -----------------------------
+def measure(fn, repeat=REPEAT):
+    # Best wall time of `repeat` runs, then the tracemalloc peak of one more run
+    best = math.inf
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak / 1e6
+
+def run(n_days, n_tickers):
+    raws = {f"T{i:03d}": make_ohlcv(n_days, seed=i) for i in range(n_tickers)}
+    first = next(iter(raws.values()))
+    rows = n_days * n_tickers
+    results = {}
+
+    for name, (fast, _) in CASES.items():
+        seconds, peak_mb = measure(lambda: [fast(raw) for raw in raws.values()])
+        results[name] = {"seconds": seconds, "rows_per_s": rows / seconds, "peak_mb": peak_mb,
+                         "parity": check_parity(name, first)}
+
+    seconds, peak_mb = measure(lambda: build_features_panel(raws))
+    results["build_features_panel"] = {"seconds": seconds, "rows_per_s": rows / seconds, "peak_mb": peak_mb,
+                                       "parity": None}
+    return results
+
+def cpu_model():
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+def environment():
+    # Timings only compare on the same machine and library versions
+    return {"cpu": cpu_model(), "cpus": os.cpu_count(), "python": platform.python_version(),
+            "numpy": np.__version__, "pandas": pd.__version__}
+
+def load_baseline(config):
+    if not BASELINE_PATH.exists():
+        return None
+    baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+    recorded = baseline.get("config", {})
+    if recorded.get("environment") != config["environment"]:
+        print(f"[WARN] Baseline {BASELINE_PATH} was recorded on {recorded.get('environment')}, not "
+              f"{config['environment']}; skipping comparison (--save-baseline records this one)")
+        return None
+    if recorded != config:
+        print(f"[WARN] Baseline {BASELINE_PATH} was recorded for {recorded.get('days')} days x "
+              f"{recorded.get('tickers')} tickers, not {config['days']} x {config['tickers']}; skipping comparison")
+        return None
+    return baseline["results"]
+
+def report(results, baseline):
+    failures = 0
+    print(f"{'case':<22}{'ms':>10}{'Mrows/s':>10}{'peak MB':>10}{'parity':>10}  vs baseline")
+    for name, r in results.items():
+        flags = []
+        if r["parity"] is not None and not r["parity"] <= RTOL:
+            flags.append(f"PARITY {r['parity']:.1e}")
+        base = (baseline or {}).get(name)
+        if base:
+            dt = r["seconds"] / base["seconds"] - 1
+            dm = r["peak_mb"] / base["peak_mb"] - 1 if base["peak_mb"] else 0.0
+            note = f"{dt:+.0%} time {dm:+.0%} mem"
+            if dt > TIME_TOLERANCE and (r["seconds"] - base["seconds"]) * 1000 > MIN_SLOWDOWN_MS:
+                flags.append("SLOWER")
+            if dm > MEMORY_TOLERANCE:
+                flags.append("MORE MEMORY")
+        else:
+            note = "-"
+        failures += bool(flags)
+        parity = "-" if r["parity"] is None else f"{r['parity']:.0e}"
+        print(f"{name:<22}{r['seconds'] * 1000:>10.1f}{r['rows_per_s'] / 1e6:>10.2f}{r['peak_mb']:>10.1f}"
+              f"{parity:>10}  {note}{'  [' + ', '.join(flags) + ']' if flags else ''}")
+    return failures
+
+def _arg(flag, default):
+    return int(sys.argv[sys.argv.index(flag) + 1]) if flag in sys.argv else default
+
+def main():
+    config = {"days": _arg("--days", N_DAYS), "tickers": _arg("--tickers", N_TICKERS), "environment": environment()}
+    results = run(config["days"], config["tickers"])
+    failures = report(results, load_baseline(config))
+
+    if "--save-baseline" in sys.argv:
+        BASELINE_PATH.write_text(json.dumps({"config": config, "results": results}, indent=2), encoding="utf-8")
+        print(f"Saved baseline: {BASELINE_PATH}")
+    elif failures:
+        print(f"[FAIL] {failures} case(s) flagged")
+        sys.exit(1)
+    else:
+        print("[OK]  no parity failures or regressions")
+
+if __name__ == "__main__":
+    main()
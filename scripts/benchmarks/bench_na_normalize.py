@@ -0,0 +1,95 @@
+from scripts.dataCleanup import dataDropEmptyRows as drop
+from pathlib import Path
+import tempfile
+import numpy as np
+import pandas as pd
+import time
+import sys
+import re
+import os
+
+#```
+# Compares the NA handling of dataDropEmptyRows against the old whole-frame strip + regex replace,
+# on the widest CSV in data/ with NA tokens, blanks and padded cells sprinkled in (NOISE_SHARE).
+# Checks that both drop the same rows and write the same file.
+# run from root: python3 -m scripts.benchmarks.bench_na_normalize [file.csv]
+#```
+
+# ========= EDIT THESE =========
+DATA_DIR = Path("data")
+NOISE_SHARE = 0.002
+NOISE = ["", "NA", "n/a", " null ", "None", "NaN", "  ", " nan", "N/A "]
+REPEAT = 3
+SEED = 42
+# ==============================
+
+def widest_csv(base: Path) -> Path:
+    files = [p for p in base.rglob("*.csv") if ".manifest" not in p.parts]
+    return max(files, key=lambda p: (len(pd.read_csv(p, nrows=0).columns), p.stat().st_size))
+
+def add_noise(src: Path, dst: Path, seed=SEED):
+    df = pd.read_csv(src, dtype=str, keep_default_na=False)
+    rng = np.random.default_rng(seed)
+    values = df.to_numpy(dtype=object)
+    hit = rng.random(values.shape) < NOISE_SHARE
+    values[hit] = rng.choice(np.array(NOISE, dtype=object), size=hit.sum())
+    padded = rng.random(values.shape) < NOISE_SHARE
+    values[padded] = [f" {v} " for v in values[padded]]
+    pd.DataFrame(values, columns=df.columns).to_csv(dst, index=False)
+
+def legacy_normalize_na(df):
+    if drop.STRIP_WHITESPACE:
+        obj = df.select_dtypes(include="object")
+        if not obj.empty:
+            df[obj.columns] = obj.apply(lambda s: s.str.strip())
+    df = df.replace({"": pd.NA})
+    if drop.NA_LIKE_STRINGS:
+        escaped = [re.escape(s) for s in drop.NA_LIKE_STRINGS]
+        regex = re.compile(rf"^\s*(?:{'|'.join(escaped)})\s*$", re.IGNORECASE)
+        df = df.replace(regex, pd.NA)
+    return df
+
+def legacy(path):
+    t0 = time.perf_counter()
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    t1 = time.perf_counter()
+    df = legacy_normalize_na(df)
+    return (t1 - t0, time.perf_counter() - t1), df
+
+def current(path):
+    t0 = time.perf_counter()
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    t1 = time.perf_counter()
+    df = drop.normalize_na(df)
+    return (t1 - t0, time.perf_counter() - t1), df
+
+def best_of(fn, path):
+    # best (read, normalize) times over REPEAT runs
+    runs = [fn(path) for _ in range(REPEAT)]
+    return min(r[0][0] for r in runs), min(r[0][1] for r in runs), runs[-1][1]
+
+def main():
+    src = Path(sys.argv[1]) if len(sys.argv) > 1 else widest_csv(DATA_DIR)
+    with tempfile.TemporaryDirectory() as tmp:
+        noisy = Path(tmp) / src.name
+        add_noise(src, noisy)
+        read_legacy, norm_legacy, df_legacy = best_of(legacy, noisy)
+        read_current, norm_current, df_current = best_of(current, noisy)
+        size_mb = os.path.getsize(noisy) / 2**20
+
+    mask_legacy, mask_current = df_legacy.isna().any(axis=1), df_current.isna().any(axis=1)
+
+    assert mask_legacy.equals(mask_current), "drop decisions differ"
+    kept_legacy, kept_current = df_legacy.loc[~mask_legacy], df_current.loc[~mask_current]
+    assert kept_legacy.to_csv(index=False) == kept_current.to_csv(index=False), "written files differ"
+    assert df_legacy.to_csv(index=False) == df_current.to_csv(index=False), "normalized cells differ"
+
+    print(f"[OK]  {src} ({df_current.shape[0]} rows x {df_current.shape[1]} cols, {size_mb:.1f} MB with noise): "
+          f"same {int(mask_current.sum())} rows dropped, same output")
+    print(f"normalize  strip/regex: {norm_legacy:.3f}s  vectorized: {norm_current:.3f}s  "
+          f"speedup: {norm_legacy / norm_current:.1f}x")
+    total_legacy, total_current = read_legacy + norm_legacy, read_current + norm_current
+    print(f"read + normalize  {total_legacy:.3f}s -> {total_current:.3f}s  speedup: {total_legacy / total_current:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+from scripts.ticker_data.reshape_history import reshape_history
+import numpy as np
+import pandas as pd
+import time
+
+#```
+# Compares reshape_history against the old per-row iterrows loop on a synthetic yf.download frame.
+# run from root: python3 -m scripts.benchmarks.bench_reshape_history
+#```
+
+# ========= EDIT THESE =========
+N_TICKERS = 100
+N_DAYS = 6500        # ~25 years of trading days
+MISSING_SHARE = 0.05 # share of NaN prices (tickers listed later, holidays)
+SEED = 42
+# ==============================
+
+def make_history(n_tickers, n_days, seed=SEED):
+    rng = np.random.default_rng(seed)
+    tickers = [f"T{i:04d}" for i in range(n_tickers)]
+    index = pd.bdate_range("2000-01-03", periods=n_days, name="Date")
+    columns = pd.MultiIndex.from_product([tickers, ["Open", "High", "Low", "Close", "Volume"]])
+    values = rng.random((n_days, len(columns))) * 100
+    values[rng.random(values.shape) < MISSING_SHARE] = np.nan
+    return pd.DataFrame(values, index=index, columns=columns), tickers
+
+def legacy_reshape(history, names):
+    results = []
+    for ticker, name in names.items():
+        ticker_history = history[ticker]
+        for date, row in ticker_history.iterrows():
+            results.append({
+                "Date": date.strftime("%Y-%m-%d"),
+                "Ticker": ticker,
+                "Name": name,
+                "Price Open": row["Open"],
+                "Price Close": row["Close"],
+                "Price High": row["High"],
+                "Price Low": row["Low"],
+                "Volume": row["Volume"],
+            })
+    return pd.DataFrame(results)
+
+def main():
+    history, tickers = make_history(N_TICKERS, N_DAYS)
+    names = {t: f"Name {t}" for t in tickers}
+
+    t0 = time.perf_counter()
+    legacy = legacy_reshape(history, names)
+    t_legacy = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    fast = reshape_history(history, names)
+    t_fast = time.perf_counter() - t0
+
+    pd.testing.assert_frame_equal(legacy, fast)
+    assert legacy.to_csv(index=False) == fast.to_csv(index=False)
+
+    print(f"[OK]  {len(fast)} rows identical ({N_TICKERS} tickers x {N_DAYS} days)")
+    print(f"iterrows: {t_legacy:.2f}s  vectorized: {t_fast:.3f}s  speedup: {t_legacy / t_fast:.0f}x")
+
+if __name__ == "__main__":
+    main()
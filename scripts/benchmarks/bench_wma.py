@@ -0,0 +1,47 @@
+from scripts.get_Indicators.GetMajorIndicators_StandaloneScript import wma, TICKERS
+import numpy as np
+import pandas as pd
+import time
+
+#```
+# Compares the vectorized wma against the old rolling().apply(lambda) version.
+# run from root: python3 -m scripts.benchmarks.bench_wma
+#```
+
+# ========= EDIT THESE =========
+N_DAYS = 6300                     # ~25 years of daily closes
+WINDOWS = [10, 20, 50, 100, 200]  # same windows as build_features
+SEED = 42
+# ==============================
+
+def legacy_wma(series, window):
+    weights = np.arange(1, window + 1)
+    return series.rolling(window).apply(lambda x: np.dot(x, weights)/weights.sum(), raw=True)
+
+def make_closes(n_tickers, n_days, seed=SEED):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2000-01-03", periods=n_days)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (n_days, n_tickers)), axis=0))
+    closes[rng.random(closes.shape) < 0.001] = np.nan  # a few missing bars
+    return [pd.Series(closes[:, i], index=index, name="Close") for i in range(n_tickers)]
+
+def main():
+    closes = make_closes(len(TICKERS), N_DAYS)
+
+    t0 = time.perf_counter()
+    legacy = [legacy_wma(c, w) for c in closes for w in WINDOWS]
+    t_legacy = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    fast = [wma(c, w) for c in closes for w in WINDOWS]
+    t_fast = time.perf_counter() - t0
+
+    for a, b in zip(legacy, fast):
+        np.testing.assert_allclose(a.to_numpy(), b.to_numpy(), rtol=1e-12, equal_nan=True)
+        assert a.index.equals(b.index)
+
+    print(f"[OK]  {len(fast)} series match ({len(TICKERS)} tickers x {N_DAYS} days x windows {WINDOWS})")
+    print(f"rolling.apply: {t_legacy:.2f}s  vectorized: {t_fast:.3f}s  speedup: {t_legacy / t_fast:.0f}x")
+
+if __name__ == "__main__":
+    main()
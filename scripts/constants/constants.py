@@ -10,3 +10,25 @@ INTERVAL = "1d"
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
 DATA_DIR = os.path.join(ROOT_DIR, "data")
 TICKER_DATA_DIR = os.path.join(DATA_DIR, "ticker_data")
+
+# Ingestion
+MAX_WORKERS = 8              # concurrent get_info lookups
+REQUESTS_PER_SECOND = 4      # shared limit across all workers
+RATE_LIMIT_RETRIES = 3       # retries for a throttled lookup
+RATE_LIMIT_BACKOFF = 5       # seconds, doubled on every retry
+
+# Ticker metadata cache (names from get_info)
+METADATA_CACHE_PATH = os.path.join(TICKER_DATA_DIR, "metadata_cache.json")
+METADATA_TTL_DAYS = 30
+
+# Batch history downloads
+DOWNLOAD_CHUNK_SIZE = 50     # starting tickers per yf.download call
+MIN_CHUNK_SIZE = 5
+MAX_CHUNK_SIZE = 200
+DOWNLOAD_TARGET_SECONDS = 30 # chunks slower than this shrink the batch size
+DOWNLOAD_RETRIES = 3         # retries per ticker before it is dropped
+DOWNLOAD_BACKOFF = 2         # seconds, doubled on every retry
+EMPTY_WINDOW_DAYS = 5        # "no price data" for a window up to this long means no new bars, not a failure
+
+# Incremental updates
+UPDATE_BUCKET_DAYS = 7       # tickers whose last stored close is within this many days share one fetch
@@ -0,0 +1,163 @@
+# csv_cleanup_pipeline.py
+# pip install pandas
+
+from pathlib import Path
+import pandas as pd
+import os
+import sys
+
+from scripts.dataCleanup import dateMatchScript, dataDiscardFromToDate, dataDropEmptyRows, dataFillupScript
+from scripts.utils.parallel_files import jobs_arg
+from scripts.utils.manifest import run_changed
+from scripts.utils import schema
+
+#```
+# Runs the cleanup scripts as one pass: every CSV is read once, the selected steps run in memory
+# and the file is written once. Same result as running the scripts one after another:
+#   dates  -> dateMatchScript        (normalize date columns to YYYY-MM-DD)
+#   window -> dataDiscardFromToDate  (keep rows inside the date window)
+#   drop   -> dataDropEmptyRows      (drop rows with empty cells)
+#   fill   -> dataFillupScript       (one row per day, forward filled; or observations only, NATIVE_FREQUENCY)
+# Date columns are parsed once and handed between steps as datetime64 (scripts/utils/dates.py).
+# Each step keeps its own settings (edit them in its script). Like the scripts, drop and fill skip
+# IGNORE_DIR_NAMES folders while dates and window also clean those files.
+# Files unchanged since the last run with the same steps and settings are skipped (data/.manifest).
+# run from root: python3 -m scripts.dataCleanup.cleanupPipeline [--steps dates,window,drop,fill] [--jobs N] [--force] [path]
+#```
+
+# ========= EDIT THESE =========
+INPUT_PATH = Path(r"data")     # file OR folder
+RECURSIVE = True               # search subfolders if INPUT_PATH is a folder
+OVERWRITE = True               # save back to same file; if False -> write *_cleaned.csv
+OUTPUT_SUFFIX = "_cleaned"     # used only if OVERWRITE=False
+STEPS = ["dates", "window", "drop", "fill"]  # pipeline order; --steps picks a subset
+IGNORE_DIR_NAMES = dataDropEmptyRows.IGNORE_DIR_NAMES
+IGNORE_CASE = True
+# ==============================
+
+ORDER = ["dates", "window", "drop", "fill"]
+DIR_FILTERED_STEPS = {"drop", "fill"}  # steps whose scripts prune IGNORE_DIR_NAMES
+
+def step_settings(call: tuple) -> dict:
+    # Settings of the steps a file goes through (the manifest key for clean_csv calls)
+    _, steps = call
+    settings = {"steps": steps, "overwrite": OVERWRITE, "suffix": OUTPUT_SUFFIX}
+    if "dates" in steps:
+        settings["dates"] = {"target_cols": dateMatchScript.TARGET_COLS, "format": dateMatchScript.DATE_FORMAT}
+    if "window" in steps:
+        settings["window"] = dataDiscardFromToDate.stage_settings()
+    if "drop" in steps:
+        settings["drop"] = {"na": sorted(dataDropEmptyRows.NA_LIKE_STRINGS), "strip": dataDropEmptyRows.STRIP_WHITESPACE,
+                            "columns": sorted(dataDropEmptyRows.COLUMNS_TO_CHECK or [])}
+    if "fill" in steps:
+        settings["fill"] = dataFillupScript.stage_settings()
+    return settings
+
+def in_ignored_dir(path: Path, base: Path) -> bool:
+    names = path.relative_to(base).parts[:-1] if path != base else ()
+    ignored = {d.lower() for d in IGNORE_DIR_NAMES} if IGNORE_CASE else set(IGNORE_DIR_NAMES)
+    return any((n.lower() if IGNORE_CASE else n) in ignored for n in names)
+
+def run_steps(df: pd.DataFrame, steps: list[str], name: str) -> tuple[pd.DataFrame, bool, list[str]]:
+    """
+    Applies steps to df in memory.
+    Returns (df, changed, notes); changed is True when any step would have rewritten the file.
+    """
+    changed = False
+    notes = []
+    dates = {}  # column -> parsed datetime64, aligned with df's rows
+    for step in steps:
+        dates = {col: parsed.loc[df.index] for col, parsed in dates.items()}
+        if step == "dates":
+            n = dateMatchScript.normalize_dates(df, dates)
+            changed |= n > 0
+            notes.append(f"{n} dates normalized")
+        elif step == "window":
+            filtered = dataDiscardFromToDate.filter_frame(df, name, dates)
+            if filtered is not None:
+                notes.append(f"window kept {len(filtered)}/{len(df)}")
+                df, changed = filtered, True
+        elif step == "drop":
+            if len(df):
+                kept = dataDropEmptyRows.drop_empty(df, name)
+                notes.append(f"-{len(df) - len(kept)} with empties")
+                df, changed = kept, True
+        elif step == "fill":
+            filled = dataFillupScript.fill_frame(df, name, dates)
+            if filled is not None:
+                notes.append(f"{'kept' if dataFillupScript.NATIVE_FREQUENCY else 'filled to'} {len(filled)} rows")
+                df, changed = filled, True
+    return df, changed, notes
+
+def clean_csv(csv_path: Path, steps: list[str]):
+    # drop reads blanks and NA tokens verbatim; the other steps read typed with pandas' NA handling
+    try:
+        if steps[0] == "drop":
+            df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+        else:
+            df = schema.read_csv(csv_path)
+    except Exception as e:
+        print(f"[ERR] Read fail: {csv_path} -> {e}")
+        return False
+
+    df, changed, notes = run_steps(df, steps, csv_path.name)
+    if not changed:
+        print(f"[OK]  {csv_path} (unchanged)")
+        return
+
+    out_path = csv_path if OVERWRITE else csv_path.with_name(f"{csv_path.stem}{OUTPUT_SUFFIX}.csv")
+    try:
+        df.to_csv(out_path, index=False)
+        schema.remember(out_path, df)
+        print(f"[OK]  {out_path}: {', '.join(notes)}")
+    except Exception as e:
+        print(f"[ERR] Write fail: {out_path} -> {e}")
+        return False
+
+def list_csvs(p: Path) -> list[Path]:
+    if p.is_file():
+        return [p] if p.suffix.lower() == ".csv" else []
+    files = []
+    for root, dirs, names in os.walk(p):
+        if not RECURSIVE:
+            dirs[:] = []
+        files += [Path(root) / n for n in sorted(names) if n.lower().endswith(".csv")]
+    return files
+
+def parse_steps(argv: list[str]) -> list[str]:
+    if "--steps" not in argv:
+        return [s for s in ORDER if s in STEPS]
+    wanted = argv[argv.index("--steps") + 1].split(",")
+    unknown = [s for s in wanted if s not in ORDER]
+    if unknown:
+        raise SystemExit(f"[ERR] Unknown step(s) {unknown}; choose from {ORDER}")
+    return [s for s in ORDER if s in wanted]  # always in pipeline order
+
+def main():
+    jobs, argv = jobs_arg(sys.argv[1:])
+    force = "--force" in argv
+    argv = [a for a in argv if a != "--force"]
+    steps = parse_steps(argv)
+    if "--steps" in argv:
+        i = argv.index("--steps")
+        argv = argv[:i] + argv[i + 2:]
+    target = (Path(argv[0]) if argv else INPUT_PATH).expanduser().resolve()
+    if not target.exists():
+        print(f"[ERR] Path not found: {target}")
+        return
+
+    base = target if target.is_dir() else target.parent
+    files = list_csvs(target)
+    if not files:
+        print(f"[INFO] No .csv files found in {target}")
+    calls = []
+    for fp in files:
+        file_steps = steps
+        if in_ignored_dir(fp, base):
+            file_steps = [s for s in steps if s not in DIR_FILTERED_STEPS]
+        if file_steps:
+            calls.append((fp, file_steps))
+    run_changed("cleanupPipeline", clean_csv, calls, step_settings, jobs, force)
+
+if __name__ == "__main__":
+    main()
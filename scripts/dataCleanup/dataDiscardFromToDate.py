@@ -3,9 +3,24 @@
 
 from pathlib import Path
 import pandas as pd
+import sys
+import os
+
+from scripts.utils.parallel_files import jobs_arg
+from scripts.utils.manifest import run_changed
+from scripts.utils.dates import parse_dates, detect_format
+from scripts.utils import schema
 
 #```
 # Discards rows that are outside of START_DATE_STR to END_DATE_STR in fields TARGET_COLS, checks all csv files in INPUT_PATH
+# --jobs N processes files on N processes (0 = all cores)
+# Files unchanged since the last run with the same settings are skipped (data/.manifest); --force reruns all
+# CHUNK_ROWS streams each file in blocks of rows (constant memory for files like merged_withIndicators.csv);
+# the result goes to a temp file that replaces the output only once the whole file is done.
+# With ASSUME_SORTED (date column ascending) blocks are only filtered up to the first one past END_DATE;
+# the rest of the file is then checked by its date column alone. A row there that the window keeps
+# (e.g. a file sorted per ticker block, not overall) or a decrease in the blocks read -> the whole file
+# is filtered after all.
 #```
 
 
@@ -19,62 +34,168 @@ DROP_UNPARSABLE = True         # rows with invalid dates -> drop (treated as out
 # Date window (inclusive)
 START_DATE_STR = "2000-01-01"
 END_DATE_STR   = "2025-08-30"  # "end at 2025 September"
+
+# Streaming
+CHUNK_ROWS = None              # e.g. 200_000 -> read/write in blocks of rows; None loads the whole file
+ASSUME_SORTED = False          # date column ascending -> only the dates are read past END_DATE
 # ==============================
 
 START_DATE = pd.Timestamp(START_DATE_STR)
 END_DATE   = pd.Timestamp(END_DATE_STR)
 
+def stage_settings() -> dict:
+    # Everything that changes the output; a different value reprocesses every file
+    return {"target_cols": TARGET_COLS, "drop_unparsable": DROP_UNPARSABLE,
+            "start": START_DATE_STR, "end": END_DATE_STR, "overwrite": OVERWRITE,
+            "assume_sorted": bool(CHUNK_ROWS) and ASSUME_SORTED}
+
 def find_date_col(df: pd.DataFrame) -> str | None:
     for c in TARGET_COLS:
         if c in df.columns:
             return c
     return None
 
-def filter_by_date(csv_path: Path):
-    try:
-        df = pd.read_csv(csv_path, dtype=str)  # read everything as string to avoid surprises
-    except Exception as e:
-        print(f"[ERR] Read fail: {csv_path} -> {e}")
-        return
-
+def filter_frame(df: pd.DataFrame, name: str, dates: dict | None = None) -> pd.DataFrame | None:
+    """
+    In-memory step: rows of df inside [START_DATE, END_DATE].
+    Returns None (and reports it) when df has no date column.
+    dates: optional {column: datetime64 Series} cache of already parsed date columns.
+    """
     col = find_date_col(df)
     if not col:
-        print(f"[SKIP] No date column ({TARGET_COLS}) in {csv_path.name}")
-        return
+        print(f"[SKIP] No date column ({TARGET_COLS}) in {name}")
+        return None
 
-    # Parse dates robustly
-    parsed = pd.to_datetime(df[col], errors="coerce", utc=False, infer_datetime_format=True)
+    # Parse dates robustly (or reuse an earlier step's parse)
+    if dates is not None and col in dates:
+        parsed = dates[col]
+    else:
+        parsed = parse_dates(df[col])
+        if dates is not None:
+            dates[col] = parsed
+
+    return df[window_mask(parsed)].copy()
 
+def window_mask(parsed: pd.Series) -> pd.Series:
     # Build mask: inside [START_DATE, END_DATE]
     in_range = (parsed >= START_DATE) & (parsed <= END_DATE)
 
     if DROP_UNPARSABLE:
-        keep_mask = in_range & parsed.notna()
-    else:
-        # Keep unparseable rows (treat as unknown), but still exclude definitively out-of-range
-        keep_mask = in_range | parsed.isna()
+        return in_range & parsed.notna()
+    # Keep unparseable rows (treat as unknown), but still exclude definitively out-of-range
+    return in_range | parsed.isna()
+
+def rest_outside_window(csv_path: Path, col: str, fmt: str | None, skip: int) -> bool:
+    # True when no row after the first `skip` ones is kept by the window; reads only the date column
+    seen = 0
+    with pd.read_csv(csv_path, dtype=str, usecols=[col], chunksize=CHUNK_ROWS) as reader:
+        for chunk in reader:
+            start = max(0, skip - seen)
+            seen += len(chunk)
+            if start < len(chunk) and window_mask(parse_dates(chunk[col].iloc[start:], fmt)).any():
+                return False
+    return True
+
+def filter_by_date_chunked(csv_path: Path, out_path: Path, assume_sorted: bool | None = None):
+    """
+    Streaming filter_by_date: CHUNK_ROWS rows in memory at a time.
+    Returns (kept, read, stopped_early), or None when the file has no date column.
+    """
+    tmp_path = out_path.with_name(f"{out_path.name}.tmp")
+    header = pd.read_csv(csv_path, dtype=str, nrows=0)
+    col = find_date_col(header)
+    if not col:
+        return None
+    kept = read = 0
+    fmt = None
+    last = None  # latest date seen so far (sorted check)
+    sorted_ok = ASSUME_SORTED if assume_sorted is None else assume_sorted
+    stopped = False
+    try:
+        header.to_csv(tmp_path, index=False)  # written first: a header-only file has no blocks
+        with pd.read_csv(csv_path, dtype=str, chunksize=CHUNK_ROWS) as reader:
+            for chunk in reader:
+                read += len(chunk)
+
+                # One format for the whole file, detected like the in-memory parse does
+                fmt = fmt or detect_format(chunk[col])
+                parsed = parse_dates(chunk[col], fmt)
+                dated = parsed.dropna()
+                if sorted_ok and not dated.empty:
+                    if not dated.is_monotonic_increasing or (last is not None and dated.iloc[0] < last):
+                        print(f"[WARN] {csv_path.name}: '{col}' is not sorted; reading the whole file")
+                        sorted_ok = False
+                    else:
+                        last = dated.iloc[-1]
+
+                block = chunk[window_mask(parsed)]
+                if len(block):
+                    block.to_csv(tmp_path, mode="a", header=False, index=False)
+                    kept += len(block)
+
+                if sorted_ok and last is not None and last > END_DATE:
+                    stopped = True  # everything after this block should be past the window
+                    break
+        if stopped and not rest_outside_window(csv_path, col, fmt, read):
+            print(f"[WARN] {csv_path.name}: '{col}' has rows in the window after {END_DATE_STR}; "
+                  f"not sorted overall, reading the whole file")
+            return filter_by_date_chunked(csv_path, out_path, assume_sorted=False)
+        os.replace(tmp_path, out_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return kept, read, stopped
+
+def filter_by_date(csv_path: Path):
+    if CHUNK_ROWS:
+        out_path = csv_path if OVERWRITE else csv_path.with_name(f"{csv_path.stem}__filtered.csv")
+        try:
+            result = filter_by_date_chunked(csv_path, out_path)
+        except Exception as e:
+            print(f"[ERR] Chunked filter fail: {csv_path} -> {e}")
+            return False
+        if result is None:
+            print(f"[SKIP] No date column ({TARGET_COLS}) in {csv_path.name}")
+            return
+        kept, read, stopped = result
+        note = f", only dates read past {END_DATE_STR}" if stopped else ""
+        print(f"[OK]  {out_path.name}: kept {kept}/{read} rows ({START_DATE_STR}..{END_DATE_STR}{note})")
+        return
+
+    try:
+        df = schema.read_csv(csv_path)  # typed only where the values round-trip exactly
+    except Exception as e:
+        print(f"[ERR] Read fail: {csv_path} -> {e}")
+        return False
 
+    df_filtered = filter_frame(df, csv_path.name)
+    if df_filtered is None:
+        return
     before = len(df)
-    df_filtered = df[keep_mask].copy()
     after = len(df_filtered)
 
     if OVERWRITE:
         try:
             df_filtered.to_csv(csv_path, index=False)
+            schema.remember(csv_path, df_filtered)
             print(f"[OK]  {csv_path.name}: kept {after}/{before} rows "
                   f"({START_DATE_STR}..{END_DATE_STR})")
         except Exception as e:
             print(f"[ERR] Write fail: {csv_path} -> {e}")
+            return False
     else:
         out_path = csv_path.with_name(f"{csv_path.stem}__filtered.csv")
         try:
             df_filtered.to_csv(out_path, index=False)
+            schema.remember(out_path, df_filtered)
             print(f"[OK]  {out_path.name}: kept {after}/{before} rows "
                   f"({START_DATE_STR}..{END_DATE_STR})")
         except Exception as e:
             print(f"[ERR] Write fail: {out_path} -> {e}")
+            return False
 
 def main():
+    jobs, _ = jobs_arg(sys.argv[1:])
     p = INPUT_PATH.expanduser().resolve()
     if p.is_file():
         if p.suffix.lower() == ".csv":
@@ -86,8 +207,8 @@ def main():
         files = list(p.glob(pattern))
         if not files:
             print(f"[INFO] No .csv files found in {p}")
-        for fp in files:
-            filter_by_date(fp)
+        run_changed("dataDiscardFromToDate", filter_by_date, [(fp,) for fp in files], stage_settings(),
+                    jobs, force="--force" in sys.argv)
     else:
         print(f"[ERR] Path not found: {p}")
 
@@ -5,10 +5,14 @@ from pathlib import Path
 import pandas as pd
 import os
 import sys
-import re   # <-- NEW
+
+from scripts.utils.parallel_files import jobs_arg, run_in_order
+from scripts.utils.na_tokens import map_text
+import numpy as np
 
 #```
 # Drops empty rows
+# --jobs N processes files on N processes (0 = all cores)
 #```
 
 # ========= EDIT THESE =========
@@ -33,43 +37,38 @@ COLUMNS_TO_CHECK: set[str] | None = None
 
 def normalize_na(df: pd.DataFrame) -> pd.DataFrame:
     """Normalize blanks/NA-like tokens to pd.NA so we can drop rows reliably."""
-    if STRIP_WHITESPACE:
-        obj = df.select_dtypes(include="object")
-        if not obj.empty:
-            df[obj.columns] = obj.apply(lambda s: s.str.strip())
-
-    # Empty strings -> NA
-    df = df.replace({"": pd.NA})
-
-    # NA-like tokens (case-insensitive) -> NA
-    if NA_LIKE_STRINGS:
-        escaped = [re.escape(s) for s in NA_LIKE_STRINGS]
-        regex = re.compile(rf"^\s*(?:{'|'.join(escaped)})\s*$", re.IGNORECASE)
-        df = df.replace(regex, pd.NA)
-
+    # Typed reads (cleanupPipeline) can hand over category columns; match their text like any other
+    cats = df.select_dtypes(include="category")
+    if not cats.empty:
+        df[cats.columns] = cats.astype(object)
+    # One vectorized pass per text column (numpy string ufuncs) instead of strip + regex per cell
+    for col in df.select_dtypes(include="object").columns:
+        normalized = map_text(df[col], na_rule)
+        if normalized is not None:
+            df[col] = normalized
     return df
 
+def na_rule(text: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Same result as stripping every cell, then replacing "" and r"^\s*(token)\s*$" (case-insensitive)
+    stripped = np.strings.strip(text)
+    cells = stripped if STRIP_WHITESPACE else text
+    is_na = cells == ""
+    if NA_LIKE_STRINGS:
+        # only cells as short as a token can be one; lower() is not a C loop in numpy
+        short = np.strings.str_len(stripped) <= max(map(len, NA_LIKE_STRINGS))
+        is_na[short] |= np.isin(np.strings.lower(stripped[short]), [t.lower() for t in NA_LIKE_STRINGS])
+    return cells, is_na
 
-def drop_empty_rows(csv_path: Path):
-    try:
-        # keep_default_na=False keeps blanks as "" so we control NA handling ourselves
-        df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
-    except Exception as e:
-        print(f"[ERR] Read fail: {csv_path} -> {e}")
-        return
-
-    before_rows = len(df)
-    if before_rows == 0:
-        print(f"[OK]  {csv_path}: 0 rows (nothing to do)")
-        return
 
+def drop_empty(df: pd.DataFrame, name: str) -> pd.DataFrame:
+    """In-memory step: df without the rows that have an empty checked column."""
     df = normalize_na(df)
 
     # -------- NEW BEHAVIOR: drop if ANY checked column is empty --------
     if COLUMNS_TO_CHECK:
         missing_cols = [c for c in COLUMNS_TO_CHECK if c not in df.columns]
         if missing_cols:
-            print(f"[WARN] {csv_path}: columns not found and ignored: {missing_cols}")
+            print(f"[WARN] {name}: columns not found and ignored: {missing_cols}")
         cols = [c for c in COLUMNS_TO_CHECK if c in df.columns]
         if cols:
             mask_any_empty = df[cols].isna().any(axis=1)
@@ -79,9 +78,23 @@ def drop_empty_rows(csv_path: Path):
         # Check all columns
         mask_any_empty = df.isna().any(axis=1)
 
-    df = df.loc[~mask_any_empty].copy()
+    return df.loc[~mask_any_empty].copy()
     # -------------------------------------------------------------------
 
+def drop_empty_rows(csv_path: Path):
+    try:
+        # keep_default_na=False keeps blanks as "" so we control NA handling ourselves
+        df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+    except Exception as e:
+        print(f"[ERR] Read fail: {csv_path} -> {e}")
+        return
+
+    before_rows = len(df)
+    if before_rows == 0:
+        print(f"[OK]  {csv_path}: 0 rows (nothing to do)")
+        return
+
+    df = drop_empty(df, str(csv_path))
     after_rows = len(df)
     removed = before_rows - after_rows
 
@@ -102,29 +115,29 @@ def should_skip_dir(name: str) -> bool:
     return name in IGNORE_DIR_NAMES
 
 
-def process_path(p: Path):
+def process_path(p: Path, jobs: int = 1):
     if p.is_file():
         if p.suffix.lower() == ".csv":
             drop_empty_rows(p)
         else:
             print(f"[SKIP] Not a .csv file: {p}")
     elif p.is_dir():
+        files = []
         if not RECURSIVE:
-            for fp in p.glob("*.csv"):
-                drop_empty_rows(fp)
+            files = list(p.glob("*.csv"))
         else:
-            for root, dirs, files in os.walk(p):
+            for root, dirs, names in os.walk(p):
                 dirs[:] = [d for d in dirs if not should_skip_dir(d)]
-                for fname in files:
-                    if fname.lower().endswith(".csv"):
-                        drop_empty_rows(Path(root) / fname)
+                files += [Path(root) / fname for fname in names if fname.lower().endswith(".csv")]
+        run_in_order(drop_empty_rows, [(fp,) for fp in files], jobs)
     else:
         print(f"[ERR] Path not found: {p}")
 
 
 def main():
-    target = Path(sys.argv[1]) if len(sys.argv) > 1 else INPUT_PATH
-    process_path(target.expanduser().resolve())
+    jobs, argv = jobs_arg(sys.argv[1:])
+    target = Path(argv[0]) if argv else INPUT_PATH
+    process_path(target.expanduser().resolve(), jobs)
 
 
 if __name__ == "__main__":
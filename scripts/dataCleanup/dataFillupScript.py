@@ -4,9 +4,20 @@
 from pathlib import Path
 import pandas as pd
 import os
+import sys
+
+from scripts.utils.parallel_files import jobs_arg
+from scripts.utils.manifest import run_changed
+from scripts.utils.dates import parse_dates
+from scripts.utils.asof import observations
+from scripts.utils import schema
 
 #```
 # Fills up missing days with last known data from last date
+# NATIVE_FREQUENCY keeps a series at its own frequency instead (only the rows where a value changes);
+# the FRED merge reads it as of each base date, which gives the same values as the daily file
+# --jobs N processes files on N processes (0 = all cores)
+# Files unchanged since the last run with the same settings are skipped (data/.manifest); --force reruns all
 #```
 
 # ========= EDIT THESE =========
@@ -16,6 +27,7 @@ OVERWRITE = True               # save back to same file; if False -> write *_fil
 DATE_CANDIDATES = ["date", "observation_date"]  # columns to try for the date
 OUTPUT_SUFFIX = "_filled"      # used only if OVERWRITE=False
 FREQUENCY = "D"                # "D" for daily; e.g., "MS" for monthly expansion
+NATIVE_FREQUENCY = True        # store observations only (no expansion); FREQUENCY is then unused
 NORMALIZE_TO_DATE = True       # drop time-of-day; keep only YYYY-MM-DD
 
 # Optional bounds (leave as None to use min/max from file)
@@ -30,36 +42,42 @@ IGNORE_CASE = True
 START_DATE = pd.to_datetime(START_DATE_STR) if START_DATE_STR else None
 END_DATE   = pd.to_datetime(END_DATE_STR)   if END_DATE_STR else None
 
+def stage_settings() -> dict:
+    # Everything that changes the output; a different value reprocesses every file
+    return {"date_candidates": DATE_CANDIDATES, "frequency": FREQUENCY, "native": NATIVE_FREQUENCY,
+            "normalize": NORMALIZE_TO_DATE,
+            "start": START_DATE_STR, "end": END_DATE_STR, "overwrite": OVERWRITE, "suffix": OUTPUT_SUFFIX}
+
 def find_date_col(df: pd.DataFrame) -> str | None:
     for c in DATE_CANDIDATES:
         if c in df.columns:
             return c
     return None
 
-def to_dateonly(s: pd.Series) -> pd.Series:
+def to_dateonly(s: pd.Series, parsed: pd.Series | None = None) -> pd.Series:
     """Parse a series to datetime and optionally normalize to date (drop time)."""
-    dt = pd.to_datetime(s, errors="coerce", utc=False, infer_datetime_format=True)
+    dt = parse_dates(s) if parsed is None else parsed
     if NORMALIZE_TO_DATE:
         dt = dt.dt.normalize()
     return dt
 
-def expand_and_ffill(csv_path: Path):
-    try:
-        df = pd.read_csv(csv_path, dtype=str)
-    except Exception as e:
-        print(f"[ERR] Read fail: {csv_path} -> {e}")
-        return
-
+def fill_frame(df: pd.DataFrame, name: str, dates: dict | None = None) -> pd.DataFrame | None:
+    """
+    In-memory step: one row per FREQUENCY period, gaps filled with the last known values
+    (NATIVE_FREQUENCY: one row per observation, dropping rows that repeat the one before).
+    Returns None (and reports why) when there is nothing to fill.
+    dates: optional {column: datetime64 Series} cache of already parsed date columns.
+    """
     date_col = find_date_col(df)
     if not date_col:
-        print(f"[SKIP] No date column ({DATE_CANDIDATES}) in {csv_path.name}")
-        return
+        print(f"[SKIP] No date column ({DATE_CANDIDATES}) in {name}")
+        return None
 
-    dt = to_dateonly(df[date_col])
+    dt = to_dateonly(df[date_col], (dates or {}).get(date_col))
     good = dt.notna()
     if not good.any():
-        print(f"[SKIP] All dates unparsable in {csv_path.name}")
-        return
+        print(f"[SKIP] All dates unparsable in {name}")
+        return None
 
     df = df.loc[good].copy()
     dt = dt.loc[good]
@@ -72,32 +90,50 @@ def expand_and_ffill(csv_path: Path):
     if END_DATE is not None:
         df = df[df.index <= END_DATE]
     if df.empty:
-        print(f"[SKIP] No rows within bounds in {csv_path.name}")
-        return
+        print(f"[SKIP] No rows within bounds in {name}")
+        return None
 
     df = df[~df.index.duplicated(keep="last")].sort_index()
+    before = len(df)
+
+    if NATIVE_FREQUENCY:
+        out = observations(df.ffill())
+        out.insert(0, date_col, out.index.strftime("%Y-%m-%d"))
+        out = out.reset_index(drop=True)
+        out.attrs["rows_before_fill"] = before
+        return out
 
     start = df.index.min() if START_DATE is None else max(df.index.min(), START_DATE)
     end   = df.index.max() if END_DATE   is None else min(df.index.max(), END_DATE)
     full_idx = pd.date_range(start=start, end=end, freq=FREQUENCY)
 
-    before = len(df)
     df = df.reindex(full_idx)
     df = df.ffill()  # carry last known value forward
 
     out = df.copy()
     out.insert(0, date_col, out.index.strftime("%Y-%m-%d"))
     out.reset_index(drop=True, inplace=True)
+    out.attrs["rows_before_fill"] = before
+    return out
 
-    added = len(out) - before
+def expand_and_ffill(csv_path: Path):
+    try:
+        df = schema.read_csv(csv_path)
+    except Exception as e:
+        print(f"[ERR] Read fail: {csv_path} -> {e}")
+        return False
 
-    if OVERWRITE:
-        out.to_csv(csv_path, index=False)
-        print(f"[OK]  {csv_path}: expanded to {len(out)} rows (+{added}), daily ffill")
-    else:
-        out_path = csv_path.with_name(f"{csv_path.stem}{OUTPUT_SUFFIX}.csv")
-        out.to_csv(out_path, index=False)
-        print(f"[OK]  {out_path}: expanded to {len(out)} rows (+{added}), daily ffill")
+    out = fill_frame(df, csv_path.name)
+    if out is None:
+        return
+    added = len(out) - out.attrs["rows_before_fill"]
+    note = f"kept {len(out)} observation rows ({added:+})" if NATIVE_FREQUENCY else \
+        f"expanded to {len(out)} rows (+{added}), daily ffill"
+
+    out_path = csv_path if OVERWRITE else csv_path.with_name(f"{csv_path.stem}{OUTPUT_SUFFIX}.csv")
+    out.to_csv(out_path, index=False)
+    schema.remember(out_path, out)
+    print(f"[OK]  {out_path}: {note}")
 
 def should_skip_dir(name: str) -> bool:
     if not IGNORE_DIR_NAMES:
@@ -106,30 +142,30 @@ def should_skip_dir(name: str) -> bool:
         return name.lower() in {d.lower() for d in IGNORE_DIR_NAMES}
     return name in IGNORE_DIR_NAMES
 
-def process_path(p: Path):
+def process_path(p: Path, jobs: int = 1, force: bool = False):
     if p.is_file():
         if p.suffix.lower() == ".csv":
             expand_and_ffill(p)
         else:
             print(f"[SKIP] Not a .csv file: {p}")
     elif p.is_dir():
+        files = []
         if not RECURSIVE:
             # top-level only
-            for fp in p.glob("*.csv"):
-                expand_and_ffill(fp)
+            files = list(p.glob("*.csv"))
         else:
             # walk and prune ignored directories
-            for root, dirs, files in os.walk(p):
+            for root, dirs, names in os.walk(p):
                 # prune dirs in-place so os.walk skips them
                 dirs[:] = [d for d in dirs if not should_skip_dir(d)]
-                for fname in files:
-                    if fname.lower().endswith(".csv"):
-                        expand_and_ffill(Path(root) / fname)
+                files += [Path(root) / fname for fname in names if fname.lower().endswith(".csv")]
+        run_changed("dataFillupScript", expand_and_ffill, [(fp,) for fp in files], stage_settings(), jobs, force)
     else:
         print(f"[ERR] Path not found: {p}")
 
 def main():
-    process_path(INPUT_PATH.expanduser().resolve())
+    jobs, _ = jobs_arg(sys.argv[1:])
+    process_path(INPUT_PATH.expanduser().resolve(), jobs, force="--force" in sys.argv)
 
 if __name__ == "__main__":
     main()
@@ -3,10 +3,16 @@
 
 from pathlib import Path
 import pandas as pd
+import sys
+
+from scripts.utils.parallel_files import jobs_arg, run_in_order
+from scripts.utils.dates import parse_dates, format_dates
+from scripts.utils import schema
 
 
 #```
 # Matches target TARGET_COLS to DATE_FORMAT in INPUT_PATH folder
+# --jobs N processes files on N processes (0 = all cores)
 #```
 
 # ========= EDIT THESE =========
@@ -17,26 +23,29 @@ TARGET_COLS = ["date", "observation_date"]  # columns to normalize if present
 DATE_FORMAT = "%Y-%m-%d"    # desired output format
 # ==============================
 
-def normalize_date_column(df: pd.DataFrame, col: str) -> int:
+def normalize_date_column(df: pd.DataFrame, col: str, dates: dict | None = None) -> int:
     """
     Convert df[col] to YYYY-MM-DD where possible.
     Returns the number of rows that changed.
+    dates: optional {column: datetime64 Series} cache; receives what a later step would parse
+    from the normalized column, so it does not have to parse it again.
     """
     if col not in df.columns:
         return 0
+    if pd.api.types.is_datetime64_dtype(df[col]):
+        # Typed read (scripts/utils/schema.py): only plain YYYY-MM-DD columns come back as dates
+        if dates is not None:
+            dates[col] = df[col]
+        return 0
 
     original = df[col].astype(str)
 
     # Try robust parsing: handles '1971-01-01 00:00:00', timezone, Excel serials, etc.
-    parsed = pd.to_datetime(
-        df[col],
-        errors="coerce",  # invalid -> NaT
-        utc=False,
-        infer_datetime_format=True
-    )
+    # (format detected once, invalid -> NaT)
+    parsed = parse_dates(df[col])
 
     # Format parsed dates; keep NaT as empty strings
-    formatted = parsed.dt.strftime(DATE_FORMAT)
+    formatted = format_dates(parsed, DATE_FORMAT)
     # Where parsing failed (NaT), fall back to original value
     formatted = formatted.where(~parsed.isna(), other=original)
 
@@ -44,20 +53,35 @@ def normalize_date_column(df: pd.DataFrame, col: str) -> int:
     changed_mask = (parsed.notna()) & (formatted != original)
     changed_count = int(changed_mask.sum())
 
+    if dates is not None:
+        failed = parsed.isna() & df[col].notna()
+        if DATE_FORMAT == "%Y-%m-%d" and parsed.dt.tz is None and not failed.any():
+            dates[col] = parsed.dt.normalize()  # exactly what parsing the formatted column gives
+        else:
+            dates[col] = parse_dates(formatted)  # unparsed leftovers: let the next parse judge them
+
     # Assign back
     df[col] = formatted
     return changed_count
 
+def normalize_dates(df: pd.DataFrame, dates: dict | None = None) -> int:
+    """
+    In-memory step: normalizes every TARGET_COLS column of df in place.
+    Returns the number of cells that changed.
+    """
+    total_changes = 0
+    for col in TARGET_COLS:
+        total_changes += normalize_date_column(df, col, dates)
+    return total_changes
+
 def process_csv(csv_path: Path):
     try:
-        df = pd.read_csv(csv_path, dtype=str)  # read as strings to avoid dtype surprises
+        df = schema.read_csv(csv_path)  # typed only where the values round-trip exactly
     except Exception as e:
         print(f"[ERR] Failed to read {csv_path}: {e}")
         return
 
-    total_changes = 0
-    for col in TARGET_COLS:
-        total_changes += normalize_date_column(df, col)
+    total_changes = normalize_dates(df)
 
     if total_changes == 0:
         print(f"[OK]  {csv_path} (no date fields changed)")
@@ -66,6 +90,7 @@ def process_csv(csv_path: Path):
     if OVERWRITE:
         try:
             df.to_csv(csv_path, index=False)
+            schema.remember(csv_path, df)
             print(f"[OK]  {csv_path} (normalized {total_changes} date cells)")
         except Exception as e:
             print(f"[ERR] Failed to write {csv_path}: {e}")
@@ -73,11 +98,13 @@ def process_csv(csv_path: Path):
         out_path = csv_path.with_name(f"{csv_path.stem}__normalized.csv")
         try:
             df.to_csv(out_path, index=False)
+            schema.remember(out_path, df)
             print(f"[OK]  {out_path} (normalized {total_changes} date cells)")
         except Exception as e:
             print(f"[ERR] Failed to write {out_path}: {e}")
 
 def main():
+    jobs, _ = jobs_arg(sys.argv[1:])
     p = INPUT_PATH.expanduser().resolve()
     if p.is_file():
         if p.suffix.lower() == ".csv":
@@ -89,8 +116,7 @@ def main():
         files = list(p.glob(pattern))
         if not files:
             print(f"[INFO] No .csv files found in {p}")
-        for fp in files:
-            process_csv(fp)
+        run_in_order(process_csv, [(fp,) for fp in files], jobs)
     else:
         print(f"[ERR] Path not found: {p}")
 
@@ -3,6 +3,11 @@
 
 from pathlib import Path
 import pandas as pd
+import sys
+
+from scripts.utils.parallel_files import jobs_arg, run_in_order
+
+# --jobs N converts workbooks on N processes (0 = all cores)
 
 # ========= EDIT THESE =========
 INPUT_PATH = Path(r"data")  # file OR folder
@@ -41,6 +46,7 @@ def convert_one_file(xlsx_path: Path):
             print(f"[OK]  {out_csv}")
 
 def main():
+    jobs, _ = jobs_arg(sys.argv[1:])
     p = INPUT_PATH.expanduser().resolve()
     if p.is_file():
         convert_one_file(p)
@@ -49,8 +55,7 @@ def main():
         files = list(p.glob(pattern))
         if not files:
             print(f"[INFO] No .xlsx files found in {p}")
-        for fp in files:
-            convert_one_file(fp)
+        run_in_order(convert_one_file, [(fp,) for fp in files], jobs)
     else:
         print(f"[ERR] Path not found: {p}")
 
@@ -1,29 +1,156 @@
 from scripts.constants.constants import START_DATE, END_DATE
 from scripts.utils.save_to_csv import save_to_csv
+from scripts.utils.rate_limiter import TokenBucket
 from scripts.fred.series import series_list
-from dotenv import load_dotenv
-from fredapi import Fred
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
 import pandas as pd
+import time
+import sys
 import os
 
-load_dotenv()
-fred = Fred(api_key=os.getenv("FRED_API_KEY"))
-
-for series_id, filename in series_list:
-    try:
-        data = fred.get_series(
-            series_id,
-            observation_start=START_DATE,
-            observation_end=END_DATE
-        )
-        df = pd.DataFrame({
-            'observation_date': data.index,
-            series_id: data.values
-        })
-        df = df.reset_index(drop=True)
-        save_to_csv(df, filename, "data/fred")
-        print(f"Successfully fetched {series_id}")
-    except Exception as e:
-        print(f"Failed to fetch {series_id}: {e}")
-
-print("All series processed.")
\ No newline at end of file
+#```
+# FRED downloads. Importing this module does no work; the client is built on the first fetch.
+#   fetch_series(["VIXCLS", "UNRATE"]) -> {"VIXCLS": DataFrame(observation_date, VIXCLS), ...}
+#   python3 -m scripts.fred.fred_api [--full-refresh]  -> refreshes data/fred/<name>.csv for series_list
+#```
+
+# -------- Settings --------
+MAX_IN_FLIGHT = 4            # concurrent FRED requests
+REQUESTS_PER_SECOND = 2      # FRED allows 120 requests per minute per API key
+RETRIES = 4
+BACKOFF = 2                  # seconds, doubled on every retry
+OUTDIR = "data/fred"
+REVISION_LOOKBACK_DAYS = 90  # re-request this much stored history to pick up revisions
+# --------------------------
+
+_fred = None
+_fred_lock = threading.Lock()
+
+def get_client():
+    # Built once, on first use, so importers do not pay for dotenv/fredapi
+    global _fred
+    with _fred_lock:
+        if _fred is None:
+            from dotenv import load_dotenv
+            from fredapi import Fred
+            load_dotenv()
+            _fred = Fred(api_key=os.getenv("FRED_API_KEY"))
+        return _fred
+
+def group_aliases(series):
+    # series_id -> [filename, ...] in list order, so a series listed twice is downloaded once
+    aliases = {}
+    for series_id, filename in series:
+        aliases.setdefault(series_id, []).append(filename)
+    return aliases
+
+def read_stored(filename):
+    path = os.path.join(OUTDIR, f"{filename}.csv")
+    if not os.path.exists(path):
+        return None
+    stored = pd.read_csv(path, float_precision="round_trip")
+    if "observation_date" not in stored.columns or stored.empty:
+        return None
+    stored["observation_date"] = pd.to_datetime(stored["observation_date"])
+    return stored
+
+def refresh_start(stored_frames, full_refresh=False):
+    """
+    First observation date to request: the oldest stored watermark minus the
+    revision look-back, or START_DATE when any alias has nothing stored yet.
+    """
+    if full_refresh or any(s is None for s in stored_frames):
+        return START_DATE
+    last = min(s["observation_date"].max() for s in stored_frames)
+    return max(START_DATE, last - pd.Timedelta(days=REVISION_LOOKBACK_DAYS))
+
+def merge_stored(stored, fresh, start):
+    """
+    Stored rows before `start` plus the fresh observations from `start` on.
+    The fresh response covers that whole span, so revisions also replace the
+    days the cleanup fill step carried forward between observations.
+    """
+    if stored is None:
+        return fresh
+    kept = stored[stored["observation_date"] < pd.Timestamp(start)]
+    merged = pd.concat([kept, fresh], ignore_index=True)
+    merged = merged.drop_duplicates(subset="observation_date", keep="last")
+    return merged.sort_values("observation_date").reset_index(drop=True)
+
+def fetch_one(series_id, limiter, start=START_DATE, end=END_DATE):
+    fred = get_client()
+    for attempt in range(RETRIES + 1):
+        limiter.acquire()
+        try:
+            data = fred.get_series(
+                series_id,
+                observation_start=start,
+                observation_end=end
+            )
+            break
+        except Exception as e:
+            # Bad Request means an unknown series id; retrying will not help
+            if attempt == RETRIES or "Bad Request" in str(e):
+                raise
+            delay = BACKOFF * 2 ** attempt
+            if "Too Many Requests" in str(e):
+                limiter.penalize(delay)  # every worker waits, not just this one
+            else:
+                time.sleep(delay)
+            print(f"Retrying {series_id} in {delay}s: {e}")
+
+    df = pd.DataFrame({
+        'observation_date': data.index,
+        series_id: data.values
+    })
+    return df.reset_index(drop=True)
+
+def fetch_series(ids, start=START_DATE, end=END_DATE, max_in_flight=MAX_IN_FLIGHT):
+    """
+    Downloads each distinct id concurrently and returns {series_id: DataFrame}.
+    `start` is one date for all ids or a dict of per-id start dates.
+    Ids that fail after retries are reported and left out.
+    """
+    ids = list(dict.fromkeys(ids))
+    starts = start if isinstance(start, dict) else dict.fromkeys(ids, start)
+    limiter = TokenBucket(REQUESTS_PER_SECOND)
+    frames = {}
+
+    with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+        futures = {
+            pool.submit(fetch_one, series_id, limiter, starts.get(series_id, START_DATE), end): series_id
+            for series_id in ids
+        }
+
+        for future in as_completed(futures):
+            series_id = futures[future]
+            try:
+                frames[series_id] = future.result()
+            except Exception as e:
+                print(f"Failed to fetch {series_id}: {e}")
+                continue
+            print(f"Successfully fetched {series_id} ({len(frames[series_id])} observations)")
+
+    return frames
+
+def refresh_files(series=series_list, full_refresh=False):
+    # Brings every data/fred/<filename>.csv in `series` up to date; one download per series id
+    aliases = group_aliases(series)
+    stored = {
+        series_id: {filename: read_stored(filename) for filename in filenames}
+        for series_id, filenames in aliases.items()
+    }
+    starts = {series_id: refresh_start(stored[series_id].values(), full_refresh) for series_id in aliases}
+
+    for series_id, df in fetch_series(list(aliases), start=starts).items():
+        for filename in aliases[series_id]:
+            save_to_csv(merge_stored(stored[series_id][filename], df, starts[series_id]), filename, OUTDIR)
+
+def main():
+    # --full-refresh ignores stored files and fetches from START_DATE
+    refresh_files(series_list, full_refresh="--full-refresh" in sys.argv)
+    print("All series processed.")
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,24 @@
 import pandas as pd
 import numpy as np
 
+from scripts.utils.na_tokens import map_text
+
+NA_TOKENS = ["", "NaN", "nan", "NULL", "null", "None", "-"]
+
+def blank_or_token(text):
+    # empty/whitespace-only cells and exact NA_TOKENS -> NaN (one vectorized pass per text column)
+    return text, (np.strings.strip(text) == "") | np.isin(text, NA_TOKENS)
+
 # Read your worksheet (change sheet_name as needed)
 df = pd.read_excel("data/indicators/NVDA_daily_features.xlsx", sheet_name="Sheet1")  # or sheet_name="Sheet1"
 
 
 
 # Treat empty strings/whitespace and common tokens as NaN
-df = df.replace(r"^\s*$", np.nan, regex=True).replace(
-    ["","NaN", "nan", "NULL", "null", "None", "-"], np.nan
-)
+for col in df.select_dtypes(include="object").columns:
+    cleaned = map_text(df[col], blank_or_token)
+    if cleaned is not None:
+        df[col] = cleaned
 
 # Drop rows that are entirely null
 df = df.dropna(how="any")
@@ -1,6 +1,6 @@
-import requests
 import pandas as pd
 from pathlib import Path
+from scripts.utils.http_client import download
 
 #```
 # gets:
@@ -18,23 +18,8 @@ URL_XLSX = f"https://fred.stlouisfed.org/graph/fredgraph.xls?id={SERIES_ID}"
 RAW_CSV = OUTDIR / "umich_consumer_sentiment_raw.csv"
 RAW_XLSX = OUTDIR / "umich_consumer_sentiment_raw.xlsx"
 TIDY_CSV = OUTDIR / "umich_consumer_sentiment_tidy.csv"
-
-HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/128.0.0.0 Safari/537.36"
-    )
-}
-TIMEOUT = 30
 # -----------------------------
 
-def download(url: str, outpath: Path):
-    r = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
-    r.raise_for_status()
-    outpath.write_bytes(r.content)
-    print(f"Saved: {outpath.resolve()}")
-
 def normalize_fred_csv(in_csv: Path, out_csv_tidy: Path, series_id: str):
     """
     Normalize FRED CSV to tidy format:
@@ -1,5 +1,6 @@
 # pip install yfinance pandas numpy
 import math
+import re
 import numpy as np
 import pandas as pd
 import yfinance as yf
@@ -31,10 +32,25 @@ def ema(series, window):
 # Uses linearly increasing weights/ also gives more weight to recent closes, but via exponential decay instead of linear weights.
 # last day in list gets weight of 1, next last day gets weight 1+n
 # divides weighted sum by sum of weights to get average
+# Vectorized: every length-`window` slice is a strided view, so one matrix-vector product
+# weights all windows at once (a window containing NaN gives NaN, like rolling().apply did)
+# Works column-wise on a DataFrame too (one column per ticker).
 def wma(series, window):
     # Linear weights: 1..window
-    weights = np.arange(1, window + 1)
-    return series.rolling(window).apply(lambda x: np.dot(x, weights)/weights.sum(), raw=True)
+    weights = np.arange(1, window + 1, dtype=float)
+    if isinstance(series, pd.DataFrame):
+        # Column by column on contiguous copies, so each ticker sums in the same order as the 1-D case
+        return pd.DataFrame({c: _wma_values(np.ascontiguousarray(series[c].to_numpy(dtype=float)), weights)
+                             for c in series.columns}, index=series.index)
+    return pd.Series(_wma_values(series.to_numpy(dtype=float), weights), index=series.index, name=series.name)
+
+def _wma_values(values, weights):
+    window = len(weights)
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        windows = np.lib.stride_tricks.sliding_window_view(values, window)
+        out[window - 1:] = windows @ weights / weights.sum()
+    return out
 
 # Financial Momentum tools
 def macd(close, fast=12, slow=26, signal=9):
@@ -76,10 +92,14 @@ def rsi(close, period=14):
 def stochastic_osc(high, low, close, k_window=14, d_window=3):
     lowest_low = low.rolling(k_window).min() # last 14 day lowest low
     highest_high = high.rolling(k_window).max() # Last 14 day highest high
-    k = 100 * (close - lowest_low) / (highest_high - lowest_low) # Measures where today's close sits within the recent high-low range.
+    k = stoch_k_from(close, lowest_low, highest_high)
     d = k.rolling(d_window).mean() # 3 day mean of k
     return k, d
 
+# The _from helpers take the rolling windows precomputed, so the feature graph can share them between indicators
+def stoch_k_from(close, lowest_low, highest_high):
+    return 100 * (close - lowest_low) / (highest_high - lowest_low) # Measures where today's close sits within the recent high-low range.
+
 # Williams %R
 # function returns the Williams %R oscillator, which is just another way of quantifying momentum by placing today’s close inside its recent trading range.
 # Outputs values between 0 and −100.
@@ -90,6 +110,9 @@ def stochastic_osc(high, low, close, k_window=14, d_window=3):
 def williams_r(high, low, close, period=14):
     highest_high = high.rolling(period).max() # Last 14 day highest high
     lowest_low = low.rolling(period).min()  # last 14 day lowest low
+    return williams_r_from(close, lowest_low, highest_high)
+
+def williams_r_from(close, lowest_low, highest_high):
     return -100 * (highest_high - close) / (highest_high - lowest_low) # Outputs values between 0 and −100.
 
 # Bollinger Bands, volatility-based indicator
@@ -105,6 +128,9 @@ def williams_r(high, low, close, period=14):
 def bollinger_bands(close, window=20, num_std=2):
     mid = sma(close, window) # moving average of 20 day close
     std = close.rolling(window).std() # Standard deviation of the closing prices over the same window. Captures volatility
+    return bollinger_from(close, mid, std, num_std)
+
+def bollinger_from(close, mid, std, num_std=2):
     upper = mid + num_std * std # upper band
     lower = mid - num_std * std # lower band
     bbp = (close - lower) / (upper - lower)  # %B
@@ -115,11 +141,11 @@ def bollinger_bands(close, window=20, num_std=2):
 # In human words, calculates swings overnight and day time and gives the swing range
 def true_range(high, low, close):
     prev_close = close.shift(1) # Yesterday's closing price aligned with today.
-    tr = pd.concat([
+    tr = np.fmax(np.fmax(
         (high - low), # intraday range 
-        (high - prev_close).abs(), # upwared gap
+        (high - prev_close).abs()), # upwared gap
         (low - prev_close).abs() # downward gap
-    ], axis=1).max(axis=1) # picks largest value ; This ensures TR always reflects the true price movement range, including both intraday swings and gaps from the prior close
+    ) # picks largest value (fmax skips NaN like max(axis=1) did, and works per column on a DataFrame) ; This ensures TR always reflects the true price movement range, including both intraday swings and gaps from the prior close
     return tr
 
 # Average True Range (ATR)
@@ -155,61 +181,238 @@ def obv(close, volume):
 # CMF > 0 → more buying pressure (closes near highs on strong volume).
 # CMF < 0 → more selling pressure (closes near lows on strong volume).
 def chaikin_money_flow(high, low, close, volume, period=20):
+    mfv = money_flow_volume(high, low, close, volume)
+    return mfv.rolling(period).sum() / volume.rolling(period).sum() # normalized rolling sum of MFV over the lookback window (20 days)
+
+def money_flow_volume(high, low, close, volume):
     mfm = ((close - low) - (high - close)) / (high - low) # measures where the close sits inside the day’s high–low range
     mfm = mfm.replace([np.inf, -np.inf], np.nan).fillna(0) # division by 0 fix
-    mfv = mfm * volume  # Scales that multiplier by trading volume.
-    return mfv.rolling(period).sum() / volume.rolling(period).sum() # normalized rolling sum of MFV over the lookback window (20 days)
+    return mfm * volume  # Scales that multiplier by trading volume.
 
 # rolling VWAP (Volume-Weighted Average Price)
 # a way of tracking the average trading price, weighted by traded volume, over a rolling window.
 # Gives a volume-adjusted price trend, often smoother and more “true to liquidity” than SMA/EMA.
 def rolling_vwap(high, low, close, volume, window=20):
-    tp = (high + low + close) / 3 # Approximate the “average” price of the day (not just the close).
-    numerator = (tp * volume).rolling(window).sum() # Multiply each day’s typical price by its trading volume and rolling sum over 20 days window
+    numerator = typical_price_volume(high, low, close, volume).rolling(window).sum() # rolling sum over 20 days window
     denom = volume.rolling(window).sum() # The sum of the volume over the same window
     return numerator / denom # Weighted average price = (sum of price × volume) ÷ (sum of volume).
 
+def typical_price_volume(high, low, close, volume):
+    tp = (high + low + close) / 3 # Approximate the “average” price of the day (not just the close).
+    return tp * volume # Multiply each day’s typical price by its trading volume
+
 # -----------------------------
 # Feature engineering pipeline
 # -----------------------------
-def build_features(df):
+# Features are nodes in a dependency graph over the helpers above. Each node (input, intermediate
+# or output column) is computed once per FeatureGraph and memoized, so only the requested columns
+# and what they need are evaluated. Rolling windows are shared nodes keyed by (series, window, stat):
+# stoch and williams_r read the same High/Low extremes, bb_mid_20 is sma_20, cmf and vwap share the
+# Volume sums. macd and the bands of a window are computed together (the _-prefixed tuple nodes,
+# which are not output columns).
+class FeatureGraph:
+    def __init__(self, open_, high, low, close, volume):
+        self.cache = {'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume}
+
+    def get(self, name):
+        if name not in self.cache:
+            self.cache[name] = resolve_node(name)(self)
+        return self.cache[name]
+
+    def rolling(self, src, window, stat):
+        key = f"{src}.rolling({window}).{stat}"
+        if key not in self.cache:
+            self.cache[key] = getattr(self.get(src).rolling(window), stat)()
+        return self.cache[key]
+
+    def extremes(self, window):
+        # (lowest low, highest high) over window
+        return self.rolling('Low', window, 'min'), self.rolling('High', window, 'max')
+
+    def hlc(self):
+        return self.get('High'), self.get('Low'), self.get('Close')
+
+    def hlcv(self):
+        return self.get('High'), self.get('Low'), self.get('Close'), self.get('Volume')
+
+STOCH_K_DEFAULT = 14           # %K window of stoch_d_<d> (stoch_d_<d>_k<k> names another one)
+STOCH_D_DEFAULT = 3            # %D window the "stoch" spec group adds to each stoch_k_<k>
+BOLLINGER_BANDS = {'bb_upper': 0, 'bb_mid': 1, 'bb_lower': 2, 'bbp': 3}
+
+# Fixed-name nodes: name -> fn(graph)
+NODES = {
+    'prev_close': lambda g: g.get('Close').shift(1),
+    'ret_pct': lambda g: g.get('Close').ffill().pct_change(fill_method=None),  # pandas' default padding, spelled out
+    'ret_log': lambda g: np.log(g.get('Close')).diff(),
+    'gap_open_prevclose': lambda g: (g.get('Open') - g.get('prev_close')) / g.get('prev_close'),
+    'spread_hl': lambda g: (g.get('High') - g.get('Low')) / g.get('prev_close'),
+    'spread_co': lambda g: (g.get('Close') - g.get('Open')) / g.get('Open'),
+    '_macd': lambda g: macd(g.get('Close')),
+    'macd': lambda g: g.get('_macd')[0],
+    'macd_signal': lambda g: g.get('_macd')[1],
+    'macd_hist': lambda g: g.get('_macd')[2],
+    'obv': lambda g: obv(g.get('Close'), g.get('Volume')),
+    'mfv': lambda g: money_flow_volume(*g.hlcv()),
+    'tpv': lambda g: typical_price_volume(*g.hlcv()),
+}
+
+# Windowed nodes: the numbers in the name are the windows/periods, e.g. sma_50, rsi_14, bb_upper_20
+PATTERNS = [
+    (r'sma_(\d+)', lambda g, w: g.rolling('Close', w, 'mean')),
+    (r'ema_(\d+)', lambda g, w: ema(g.get('Close'), w)),
+    (r'wma_(\d+)', lambda g, w: wma(g.get('Close'), w)),
+    (r'rsi_(\d+)', lambda g, p: rsi(g.get('Close'), p)),
+    (r'stoch_k_(\d+)', lambda g, k: stoch_k_from(g.get('Close'), *g.extremes(k))),
+    (r'stoch_d_(\d+)(?:_k(\d+))?', lambda g, d, k=None: g.rolling(f'stoch_k_{k or STOCH_K_DEFAULT}', d, 'mean')),
+    (r'williams_r_(\d+)', lambda g, p: williams_r_from(g.get('Close'), *g.extremes(p))),
+    (r'_bollinger_(\d+)', lambda g, w: bollinger_from(g.get('Close'), g.get(f'sma_{w}'), g.rolling('Close', w, 'std'), 2)),
+    (r'(bb_upper|bb_mid|bb_lower|bbp)_(\d+)', lambda g, band, w: g.get(f'_bollinger_{w}')[BOLLINGER_BANDS[band]]),
+    (r'atr_(\d+)', lambda g, p: atr(*g.hlc(), p)),
+    (r'hv_(\d+)', lambda g, w: hist_vol(g.get('ret_log'), w)),
+    (r'cmf_(\d+)', lambda g, p: g.rolling('mfv', p, 'sum') / g.rolling('Volume', p, 'sum')),
+    (r'vwap_(\d+)', lambda g, w: g.rolling('tpv', w, 'sum') / g.rolling('Volume', w, 'sum')),
+]
+PATTERNS = [(re.compile(rx), fn) for rx, fn in PATTERNS]
+
+def resolve_node(name):
+    if name in NODES:
+        return NODES[name]
+    for rx, fn in PATTERNS:
+        m = rx.fullmatch(name)
+        if m:
+            # numbers become ints; optional groups that did not match are left to the fn's defaults
+            args = [int(a) if a.isdigit() else a for a in m.groups() if a is not None]
+            return lambda g, fn=fn, args=args: fn(g, *args)
+    raise KeyError(f"Unknown feature: {name}")
+
+# Output columns of build_features, in order
+FEATURE_COLUMNS = (
+    ['ret_pct', 'ret_log', 'gap_open_prevclose', 'spread_hl', 'spread_co']
+    + [f'{kind}_{w}' for w in [10, 20, 50, 100, 200] for kind in ('sma', 'ema', 'wma')]
+    + ['macd', 'macd_signal', 'macd_hist', 'rsi_14',
+       'stoch_k_14', 'stoch_d_3', 'williams_r_14',
+       'bb_upper_20', 'bb_mid_20', 'bb_lower_20', 'bbp_20',
+       'atr_14', 'hv_20', 'obv', 'cmf_20', 'vwap_20']
+)
+
+# Shorthand groups for feature specs: {"sma": [5, 20], "macd": true, "bollinger": [20], "stoch": [14, 21]}
+# (window None = the group's default; "stoch" gives %K and its 3-day %D for each %K window)
+SPEC_GROUPS = {
+    'macd': lambda _: ['macd', 'macd_signal', 'macd_hist'],
+    'stoch': lambda w: ([f'stoch_k_{w or STOCH_K_DEFAULT}', f'stoch_d_{STOCH_D_DEFAULT}']
+                        if w in (None, STOCH_K_DEFAULT) else [f'stoch_k_{w}', f'stoch_d_{STOCH_D_DEFAULT}_k{w}']),
+    'bollinger': lambda w: [f'{kind}_{w or 20}' for kind in ('bb_upper', 'bb_mid', 'bb_lower', 'bbp')],
+}
+
+def expand_feature_spec(spec):
+    """
+    Turns a feature spec into output column names.
+    A spec is a list of column names (["sma_10", "rsi_14", "macd"]) or a dict of
+    indicator -> windows ({"sma": [10, 50], "rsi": [14], "macd": true}).
+    Unknown names raise KeyError before anything is computed.
+    """
+    if isinstance(spec, dict):
+        columns = []
+        for kind, windows in spec.items():
+            if windows is True:
+                windows = [None]
+            for w in windows:
+                if kind in SPEC_GROUPS:
+                    columns += SPEC_GROUPS[kind](w)
+                else:
+                    columns.append(kind if w is None else f'{kind}_{w}')
+    else:
+        columns = []
+        for name in spec:
+            columns += SPEC_GROUPS[name](None) if name in SPEC_GROUPS else [name]
+    columns = list(dict.fromkeys(columns))
+    for col in columns:
+        if col.startswith('_'):
+            raise KeyError(f"Not a feature column: {col}")
+        resolve_node(col)
+    return columns
+
+def load_feature_spec(path):
+    # JSON file holding a spec (see expand_feature_spec), optionally under a "features" key
+    import json
+    with open(path, encoding="utf-8") as fh:
+        spec = json.load(fh)
+    if isinstance(spec, dict) and 'features' in spec:
+        spec = spec['features']
+    return expand_feature_spec(spec)
+
+def compute_features(open_, high, low, close, volume, features=None):
+    """
+    Computes engineered features from OHLCV inputs, in output column order.
+    Inputs are Series (one ticker) or DataFrames with one column per ticker;
+    the indicators are column-wise, so both give the same per-ticker numbers.
+    `features` lists the columns to produce (default: FEATURE_COLUMNS); the graph
+    only evaluates those columns and the nodes they depend on.
+    """
+    g = FeatureGraph(open_, high, low, close, volume)
+    return {col: g.get(col) for col in (FEATURE_COLUMNS if features is None else features)}
+
+def _compact(out, columns, label):
+    # float32 indicator columns (rounded to ~7 significant digits), reporting the memory saved like the merges do
+    from scripts.utils.compact_frame import compact_frame, memory_mb, report_memory
+    before = memory_mb(out)
+    out = compact_frame(out, floats=columns, exact_floats=False)
+    report_memory(label, before, memory_mb(out))
+    return out
+
+def build_features(df, features=None, compact=False, label="features"):
     """
     Expects a DataFrame with columns:
     ['Open','High','Low','Close','Adj Close','Volume']
-    Returns df with engineered features.
+    Returns df with engineered features (all of them, or the `features` columns).
+    compact=True stores the indicator columns as float32, rounding them to ~7 significant digits
+    (see scripts/utils/compact_frame.py), and reports the memory saved under `label`.
     """
     out = df.copy()
-
-    # Basic returns & spreads (use adjusted Close)
-    out['ret_pct'] = out['Close'].pct_change()
-    out['ret_log'] = np.log(out['Close']).diff()
-    out['gap_open_prevclose'] = (out['Open'] - out['Close'].shift(1)) / out['Close'].shift(1)
-    out['spread_hl'] = (out['High'] - out['Low']) / out['Close'].shift(1)
-    out['spread_co'] = (out['Close'] - out['Open']) / out['Open']
-
-    # Trend: SMA/EMA/WMA
-    for w in [10, 20, 50, 100, 200]:
-        out[f'sma_{w}'] = sma(out['Close'], w)
-        out[f'ema_{w}'] = ema(out['Close'], w)
-        out[f'wma_{w}'] = wma(out['Close'], w)
-
-    # MACD / RSI (on adjusted Close)
-    out['macd'], out['macd_signal'], out['macd_hist'] = macd(out['Close'])
-    out['rsi_14'] = rsi(out['Close'], 14)
-
-    # Momentum/Volatility using adjusted OHLC and Volume (already adjusted by yfinance)
-    out['stoch_k_14'], out['stoch_d_3'] = stochastic_osc(out['High'], out['Low'], out['Close'], 14, 3)
-    out['williams_r_14'] = williams_r(out['High'], out['Low'], out['Close'], 14)
-    out['bb_upper_20'], out['bb_mid_20'], out['bb_lower_20'], out['bbp_20'] = bollinger_bands(out['Close'], 20, 2)
-    out['atr_14'] = atr(out['High'], out['Low'], out['Close'], 14)
-    out['hv_20'] = hist_vol(out['ret_log'], 20)
-
-    # Volume-based (Volume is adjusted when auto_adjust=True)
-    out['obv'] = obv(out['Close'], out['Volume'])
-    out['cmf_20'] = chaikin_money_flow(out['High'], out['Low'], out['Close'], out['Volume'], 20)
-    out['vwap_20'] = rolling_vwap(out['High'], out['Low'], out['Close'], out['Volume'], 20)
+    feats = compute_features(out['Open'], out['High'], out['Low'], out['Close'], out['Volume'], features)
+    for col, values in feats.items():
+        out[col] = values
 
     out.replace([np.inf, -np.inf], np.nan, inplace=True)
+    if compact:
+        out = _compact(out, list(feats), label)
+    return out
+
+OHLCV = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+def build_features_panel(raws, features=None, compact=False):
+    """
+    Batched build_features for many tickers: {name: raw df} -> {name: features df}.
+    Each field becomes one 2-D array with a column per ticker. Tickers keep their
+    own trading calendars: every column holds that ticker's bars from row 0 and is
+    NaN-padded at the end, so rolling/EWM state never sees another calendar's gaps
+    and the padding (which only trails) cannot change earlier values.
+    """
+    names = list(raws)
+    if not names:
+        return {}
+    lengths = [len(raws[n]) for n in names]
+    rows = max(lengths)
+
+    panel = {}
+    for field in OHLCV:
+        arr = np.full((rows, len(names)), np.nan)
+        for j, n in enumerate(names):
+            arr[:lengths[j], j] = raws[n][field].to_numpy(dtype=float)
+        panel[field] = pd.DataFrame(arr, columns=names)
+
+    feats = compute_features(panel['Open'], panel['High'], panel['Low'], panel['Close'], panel['Volume'], features)
+    columns = list(feats)
+    cube = np.stack([feats[col].to_numpy() for col in columns], axis=2)  # rows x tickers x features
+    cube[np.isinf(cube)] = np.nan
+
+    out = {}
+    for j, n in enumerate(names):
+        raw = raws[n]
+        block = pd.DataFrame(cube[:lengths[j], j, :], index=raw.index, columns=columns)
+        out[n] = pd.concat([raw.replace([np.inf, -np.inf], np.nan), block], axis=1)
+        if compact:
+            out[n] = _compact(out[n], columns, n)
     return out
 
 # -----------------------------
@@ -245,27 +448,139 @@ def _strip_tz_index(df: pd.DataFrame) -> pd.DataFrame:
 # -----------------------------
 # Main pipeline
 # -----------------------------
-def run_pipeline(tickers, output_dir="data/indicators"):
+MERGED_FIRST = ['date', 'ticker', 'symbol']
+
+def _save_state(name, raw, feats, output_dir, features):
+    # Running indicator state, so streaming_features can append new days without a full rebuild.
+    # It needs the full feature set: a spec run removes the state of an earlier full run instead,
+    # which would no longer match the narrowed feature file.
+    import os
+    from scripts.get_Indicators.streaming_features import init_state, save_state, state_path
+    from scripts.utils.compact_frame import widen
+    path = state_path(output_dir, name)
+    if features is None:
+        full = feats.assign(**{c: widen(feats[c]) for c in feats.columns if feats[c].dtype == "float32"})
+        save_state(init_state(raw, full), path)
+    elif os.path.exists(path):
+        os.remove(path)
+
+def _build_and_save(name, tkr, raw, output_dir, features, columns, dtypes, compact=False):
+    """
+    Process-pool task: features + per-ticker CSV + streaming state for one ticker.
+    Returns the ticker's rows of merged_daily_features.csv as CSV text (no header) and
+    their count, so only text travels back to the parent.
+    """
+    import os
+    from scripts.utils.compact_frame import widen
+    feats = build_features(raw, features, compact, label=name)
+    feats['ticker'] = name
+    feats['symbol'] = tkr
+    out_path = os.path.join(output_dir, f"{name}_daily_features.csv")
+    feats.to_csv(out_path, index=True)
+    _save_state(name, raw, feats, output_dir, features)
+    print(f"Saved: {out_path} ({len(feats)} rows)")
+    block = feats.reset_index()
+    # the layout is float64; float32 columns go back through their digits so the text stays the same
+    block = block.assign(**{c: widen(block[c]) for c in block.columns if block[c].dtype == "float32"})
+    block = block.reindex(columns=columns).astype(dtypes)
+    return block.to_csv(index=False, header=False), len(block)
+
+def _merged_layout(tickers, raws, features):
+    # Columns and dtypes of pd.concat over all tickers (run_pipeline's merged file), from one row each
+    probe = []
+    for name, raw in raws.items():
+        head = build_features(raw.iloc[:1], features)
+        head['ticker'] = name
+        head['symbol'] = tickers[name]
+        probe.append(head)
+    probe = pd.concat(probe, axis=0).reset_index()
+    columns = MERGED_FIRST + [c for c in probe.columns if c not in MERGED_FIRST]
+    return columns, probe[columns].dtypes.to_dict()
+
+def _run_pipeline_parallel(tickers, output_dir, workers, features=None, compact=False):
+    """
+    Downloads on a thread pool, then builds and writes the tickers in a process pool.
+    The merged file's columns are the union over all tickers, so builds start once
+    every download is in; each build returns its merged rows as CSV text, written in
+    ticker order as soon as it and all tickers before it are done.
+    """
+    import os
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=workers) as threads:
+        fetched = dict(zip(tickers, threads.map(lambda tkr: fetch_yahoo(tkr, START), tickers.values())))
+    raws = {}
+    for name, raw in fetched.items():
+        if raw.empty:
+            print(f"[WARN] No data for {name} ({tickers[name]}).")
+            continue
+        raws[name] = raw
+    if not raws:
+        return
+    columns, dtypes = _merged_layout(tickers, raws, features)
+
+    merged_path = os.path.join(output_dir, "merged_daily_features.csv")
+    rows = 0
+    with ProcessPoolExecutor(max_workers=workers) as procs:
+        builds = [procs.submit(_build_and_save, name, tickers[name], raw, output_dir, features, columns, dtypes, compact)
+                  for name, raw in raws.items()]
+        del raws, fetched
+        with open(merged_path, "w", encoding="utf-8", newline="") as fh:
+            fh.write(",".join(columns) + "\n")
+            for build in builds:  # ticker order; waits only for the next ticker
+                chunk, n = build.result()
+                fh.write(chunk)
+                rows += n
+    print(f"Saved: {merged_path} ({rows} rows)")
+
+def run_pipeline(tickers, output_dir="data/indicators", batched=True, workers=1, features=None, compact=False):
+    """
+    batched=True computes the indicators for all tickers in one vectorized pass
+    (build_features_panel); batched=False runs build_features ticker by ticker.
+    workers > 1 downloads on threads and builds/writes tickers in a process pool
+    instead, ticker by ticker (batched does not apply: the panel pass is one
+    vectorized computation, not split across processes). All modes write the same files.
+    features: optional list of columns (see expand_feature_spec); only those are computed.
+    Streaming state files need the full set, so they are only written when features is None
+    (and removed otherwise).
+    compact: float32 indicator columns (build_features(compact=True)), with a memory report per
+    ticker; the files then hold the float32 digits, the same in every mode.
+    """
     import os
     os.makedirs(output_dir, exist_ok=True)
+    if workers > 1:
+        _run_pipeline_parallel(tickers, output_dir, workers, features, compact)
+        return
 
-    per_ticker = []
+    raws = {}
     for name, tkr in tickers.items():
         raw = fetch_yahoo(tkr, START)
         if raw.empty:
             print(f"[WARN] No data for {name} ({tkr}).")
             continue
+        raws[name] = raw
 
-        feats = build_features(raw)
+    if batched:
+        results = build_features_panel(raws, features, compact)
+    else:
+        results = {name: build_features(raw, features, compact, label=name) for name, raw in raws.items()}
+
+    per_ticker = []
+    for name, feats in results.items():
+        tkr = tickers[name]
         feats['ticker'] = name
         feats['symbol'] = tkr
 
         out_path = os.path.join(output_dir, f"{name}_daily_features.csv")
         feats.to_csv(out_path, index=True)
+        _save_state(name, raws[name], feats, output_dir, features)
         print(f"Saved: {out_path} ({len(feats)} rows)")
         per_ticker.append(feats)
 
     if per_ticker:
+        if compact:
+            from scripts.utils.compact_frame import align_floats
+            per_ticker = align_floats(per_ticker)
         tidy = pd.concat(per_ticker, axis=0, ignore_index=False)
         tidy.index.name = 'date'
         tidy = tidy.reset_index()
@@ -273,9 +588,8 @@ def run_pipeline(tickers, output_dir="data/indicators"):
         if isinstance(tidy.columns, pd.MultiIndex):
             tidy.columns = [c[0] for c in tidy.columns]
 
-        keep_first = ['date', 'ticker', 'symbol']
-        rest = [c for c in tidy.columns if c not in keep_first]
-        tidy = tidy[keep_first + rest]
+        rest = [c for c in tidy.columns if c not in MERGED_FIRST]
+        tidy = tidy[MERGED_FIRST + rest]
 
         merged_path = os.path.join(output_dir, "merged_daily_features.csv")
         tidy.to_csv(merged_path, index=False)
@@ -291,7 +605,13 @@ TICKERS = [
 SYMBOL_MAP = {t: t for t in TICKERS}
 
 if __name__ == "__main__":
-    run_pipeline(SYMBOL_MAP)
+    # --workers N downloads and builds tickers in parallel
+    # --features path/to/spec.json computes only the listed indicators
+    # --compact keeps indicator columns as float32 (~7 significant digits) and reports the memory saved
+    import sys
+    workers = int(sys.argv[sys.argv.index("--workers") + 1]) if "--workers" in sys.argv else 1
+    spec = load_feature_spec(sys.argv[sys.argv.index("--features") + 1]) if "--features" in sys.argv else None
+    run_pipeline(SYMBOL_MAP, workers=workers, features=spec, compact="--compact" in sys.argv)
 
 
 
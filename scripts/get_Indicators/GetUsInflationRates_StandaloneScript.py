@@ -1,6 +1,6 @@
-import requests
 import pandas as pd
 from pathlib import Path
+from scripts.utils.http_client import download
 
 OUTDIR = Path("data/us_inflation")
 OUTDIR.mkdir(parents=True, exist_ok=True)
@@ -11,22 +11,11 @@ URL_CSV = f"https://fred.stlouisfed.org/graph/fredgraph.csv?id={SERIES_ID}"
 OUT_RAW = OUTDIR / f"{SERIES_ID}_raw.csv"
 OUT_TIDY = OUTDIR / f"{SERIES_ID}_tidy.csv"
 
-HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/128.0.0.0 Safari/537.36"
-    )
-}
-
-def download_csv(url, outpath):
-    r = requests.get(url, headers=HEADERS, timeout=30)
-    r.raise_for_status()
-    outpath.write_bytes(r.content)
-    print(f"Saved: {outpath.resolve()}")
-
 def main():
-    download_csv(URL_CSV, OUT_RAW)
+    changed = download(URL_CSV, OUT_RAW)
+    if not changed and OUT_TIDY.exists():
+        print(f"Tidy CSV up to date: {OUT_TIDY.resolve()}")
+        return
     df = pd.read_csv(OUT_RAW)
 
     # Standardize column names
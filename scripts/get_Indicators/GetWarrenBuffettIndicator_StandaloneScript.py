@@ -1,5 +1,7 @@
-import requests
+import json
 import pandas as pd
+from pathlib import Path
+from scripts.utils.http_client import fetch
 
 #```
 # Gets :
@@ -15,17 +17,14 @@ outpath = DIR+"/"+FILENAME
 url = "https://buffettindicator.net/wp-content/themes/flashmag/data/history.json"
 
 headers = {
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/128.0.0.0 Safari/537.36"
-    ),
     "Referer": "https://buffettindicator.net/"
 }
 
-resp = requests.get(url, headers=headers, timeout=30)
-resp.raise_for_status()
-data = resp.json()
+content, changed = fetch(url, headers=headers)
+if not changed and Path(outpath).exists():
+    print("Unchanged " + outpath)
+    raise SystemExit(0)
+data = json.loads(content)
 
 df = pd.DataFrame(data)
 df = df.rename(columns={
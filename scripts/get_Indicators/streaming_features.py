@@ -0,0 +1,258 @@
+import json
+import math
+import os
+import numpy as np
+import pandas as pd
+from scripts.get_Indicators.GetMajorIndicators_StandaloneScript import SYMBOL_MAP, FEATURE_COLUMNS, ema, fetch_yahoo
+
+#```
+# Incremental indicators: appends new trading days to the *_daily_features.csv files without recomputing history.
+# run_pipeline writes <name>_state.json next to each feature file; it holds every running value the
+# indicators need (EMA levels, Wilder averages, cumulative OBV, last close, short rolling buffers),
+# so each new bar costs the same no matter how long the history is.
+# Missing values (NaN bars) are handled like the batch path: EWMs skip them but keep aging (pandas'
+# ewm with ignore_na=False), OBV adds nothing, and ret_pct compares against the last known close.
+#   python3 -m scripts.get_Indicators.streaming_features
+#```
+
+EMA_SPANS = [10, 20, 50, 100, 200, 12, 26]   # trend EMAs + MACD fast/slow
+MA_WINDOWS = [10, 20, 50, 100, 200]
+BUFFER = max(MA_WINDOWS)                      # longest rolling window kept in the state
+RSI_PERIOD = 14
+ATR_PERIOD = 14
+STOCH_K, STOCH_D = 14, 3
+WINDOW_20 = 20                                # Bollinger, HV, CMF, VWAP
+MACD_SIGNAL = 9
+TRADING_DAYS = 252
+
+def _tail(values, n):
+    return [float(v) for v in np.asarray(values, dtype=float)[-n:]]
+
+def _ewm_weight(values, alpha):
+    # Weight pandas' ewm(adjust=False) gives its running value at the end of `values`:
+    # 1 after an observation, times (1 - alpha) for every NaN since
+    valid = np.flatnonzero(~np.isnan(np.asarray(values, dtype=float)))
+    if not len(valid):
+        return 1.0
+    return (1 - alpha) ** (len(values) - 1 - valid[-1])
+
+def init_state(raw, feats):
+    """
+    Builds the running state after the last bar of a batch build_features run.
+    `raw` is the OHLCV frame the features were computed from.
+    """
+    close = raw['Close']
+    delta = close.diff()
+    alpha = 1 / RSI_PERIOD
+    tr = np.fmax(np.fmax(raw['High'] - raw['Low'], (raw['High'] - close.shift()).abs()), (raw['Low'] - close.shift()).abs())
+    macd_line = ema(close, 12) - ema(close, 26)
+    last_close = close.ffill().iloc[-1]
+    return {
+        "last_date": raw.index[-1].strftime("%Y-%m-%d"),
+        "prev_close": float(close.iloc[-1]),
+        "last_close": float(last_close),
+        "closes": _tail(close, BUFFER),
+        "highs": _tail(raw['High'], STOCH_K),
+        "lows": _tail(raw['Low'], STOCH_K),
+        "volumes": _tail(raw['Volume'], WINDOW_20),
+        "mfv": _tail(_money_flow_volume(raw['High'], raw['Low'], close, raw['Volume']), WINDOW_20),
+        "tpv": _tail((raw['High'] + raw['Low'] + close) / 3 * raw['Volume'], WINDOW_20),
+        "log_rets": _tail(feats['ret_log'], WINDOW_20),
+        "stoch_k": _tail(feats['stoch_k_14'], STOCH_D),
+        "ema": {str(span): float(ema(close, span).iloc[-1]) for span in EMA_SPANS},
+        "macd_signal": float(feats['macd_signal'].iloc[-1]),
+        "rsi_gain": float(delta.clip(lower=0).ewm(alpha=alpha, adjust=False).mean().iloc[-1]),
+        "rsi_loss": float((-delta.clip(upper=0)).ewm(alpha=alpha, adjust=False).mean().iloc[-1]),
+        "atr": float(feats['atr_14'].iloc[-1]),
+        "obv": float(feats['obv'].iloc[-1]),
+        "ewm_weight": {
+            **{f"ema_{span}": _ewm_weight(close, 2 / (span + 1)) for span in EMA_SPANS},
+            "macd_signal": _ewm_weight(macd_line, 2 / (MACD_SIGNAL + 1)),
+            "rsi_gain": _ewm_weight(delta, alpha),
+            "rsi_loss": _ewm_weight(delta, alpha),
+            "atr": _ewm_weight(tr, 1 / ATR_PERIOD),
+        },
+    }
+
+def _money_flow_volume(high, low, close, volume):
+    mfm = ((close - low) - (high - close)) / (high - low)
+    mfm = mfm.replace([np.inf, -np.inf], np.nan).fillna(0)
+    return mfm * volume
+
+def _window(buffer, n, value):
+    # Appends value and returns the last n entries as an array (NaN-padded while the history is short)
+    buffer.append(float(value))
+    del buffer[:-n]
+    window = np.asarray(buffer, dtype=float)
+    if len(window) < n:
+        window = np.concatenate([np.full(n - len(window), np.nan), window])
+    return window
+
+def _div(a, b):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return float(np.float64(a) / np.float64(b))
+
+def _ewm(state, name, prev, value, alpha):
+    """
+    One step of pandas' ewm(alpha, adjust=False).mean() (same arithmetic, so the same bits).
+    A NaN value leaves the mean as it is but ages it, so the next observation weighs more;
+    the age is kept in state["ewm_weight"][name] (state files from before default to 1).
+    """
+    weights = state.setdefault("ewm_weight", {})
+    if math.isnan(prev):
+        return value
+    weight = weights.get(name, 1.0) * (1 - alpha)
+    if not math.isnan(value):
+        if value != prev:
+            prev = (weight * prev + alpha * value) / (weight + alpha)
+        weight = 1.0
+    weights[name] = weight
+    return prev
+
+def update_state(state, date, bar):
+    """
+    Advances the state by one bar (a mapping with Open/High/Low/Close/Volume)
+    and returns the feature values for that day, in compute_features order.
+    """
+    o, h, l, c, v = (float(bar[k]) for k in ('Open', 'High', 'Low', 'Close', 'Volume'))
+    pc = state["prev_close"]
+    last = state.get("last_close", pc)  # last non-NaN close
+    f = {}
+
+    # Basic returns & spreads
+    f['ret_pct'] = _div((last if math.isnan(c) else c) - last, last)
+    f['ret_log'] = math.log(c) - math.log(pc)
+    f['gap_open_prevclose'] = _div(o - pc, pc)
+    f['spread_hl'] = _div(h - l, pc)
+    f['spread_co'] = _div(c - o, o)
+
+    # Trend: SMA/EMA/WMA
+    closes = state["closes"]
+    closes.append(c)
+    del closes[:-BUFFER]
+    arr = np.asarray(closes, dtype=float)
+    for span in EMA_SPANS:
+        state["ema"][str(span)] = _ewm(state, f"ema_{span}", state["ema"][str(span)], c, 2 / (span + 1))
+    for w in MA_WINDOWS:
+        window = arr[-w:] if len(arr) >= w else None
+        f[f'sma_{w}'] = float(window.mean()) if window is not None else np.nan
+        f[f'ema_{w}'] = state["ema"][str(w)]
+        if window is not None:
+            weights = np.arange(1, w + 1, dtype=float)
+            f[f'wma_{w}'] = float(window @ weights / weights.sum())
+        else:
+            f[f'wma_{w}'] = np.nan
+
+    # MACD / RSI
+    macd_line = state["ema"]["12"] - state["ema"]["26"]
+    state["macd_signal"] = _ewm(state, "macd_signal", state["macd_signal"], macd_line, 2 / (MACD_SIGNAL + 1))
+    f['macd'], f['macd_signal'] = macd_line, state["macd_signal"]
+    f['macd_hist'] = macd_line - state["macd_signal"]
+    delta = c - pc
+    state["rsi_gain"] = _ewm(state, "rsi_gain", state["rsi_gain"], max(delta, 0.0), 1 / RSI_PERIOD)  # max keeps NaN
+    state["rsi_loss"] = _ewm(state, "rsi_loss", state["rsi_loss"], max(-delta, 0.0), 1 / RSI_PERIOD)
+    f['rsi_14'] = 100 - _div(100, 1 + _div(state["rsi_gain"], state["rsi_loss"]))
+
+    # Momentum/Volatility
+    highs = _window(state["highs"], STOCH_K, h)
+    lows = _window(state["lows"], STOCH_K, l)
+    hh, ll = highs.max(), lows.min()
+    k = _div(100 * (c - ll), hh - ll)
+    f['stoch_k_14'] = k
+    f['stoch_d_3'] = float(_window(state["stoch_k"], STOCH_D, k).mean())
+    f['williams_r_14'] = _div(-100 * (hh - c), hh - ll)
+
+    window20 = arr[-WINDOW_20:] if len(arr) >= WINDOW_20 else np.full(WINDOW_20, np.nan)
+    mid = float(window20.mean())
+    std = float(window20.std(ddof=1))
+    upper, lower = mid + 2 * std, mid - 2 * std
+    f['bb_upper_20'], f['bb_mid_20'], f['bb_lower_20'] = upper, mid, lower
+    f['bbp_20'] = _div(c - lower, upper - lower)
+
+    tr = np.fmax(np.fmax(h - l, abs(h - pc)), abs(l - pc))
+    state["atr"] = _ewm(state, "atr", state["atr"], float(tr), 1 / ATR_PERIOD)
+    f['atr_14'] = state["atr"]
+    f['hv_20'] = float(_window(state["log_rets"], WINDOW_20, f['ret_log']).std(ddof=1)) * math.sqrt(TRADING_DAYS)
+
+    # Volume-based
+    move = float(np.sign(delta)) * v
+    state["obv"] += 0.0 if math.isnan(move) else move  # no direction or volume: OBV stays
+    f['obv'] = state["obv"]
+    mfm = _div((c - l) - (h - c), h - l)
+    mfm = 0.0 if not math.isfinite(mfm) else mfm
+    volumes = _window(state["volumes"], WINDOW_20, v)
+    f['cmf_20'] = _div(_window(state["mfv"], WINDOW_20, mfm * v).sum(), volumes.sum())
+    f['vwap_20'] = _div(_window(state["tpv"], WINDOW_20, (h + l + c) / 3 * v).sum(), volumes.sum())
+
+    state["prev_close"] = c
+    state["last_close"] = last if math.isnan(c) else c
+    state["last_date"] = pd.Timestamp(date).strftime("%Y-%m-%d")
+    return {col: (np.nan if isinstance(val, float) and math.isinf(val) else val) for col, val in f.items()}
+
+def state_path(output_dir, name):
+    return os.path.join(output_dir, f"{name}_state.json")
+
+def save_state(state, path):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(state, fh)
+    os.replace(tmp, path)
+
+def load_state(path):
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+def _append_rows(path, rows):
+    # Appends in the file's own column order; columns the file does not have are dropped
+    header = pd.read_csv(path, nrows=0).columns
+    frame = pd.DataFrame(rows).reindex(columns=header)
+    frame.to_csv(path, mode="a", header=False, index=False)
+
+def update_pipeline(tickers, output_dir="data/indicators"):
+    """
+    Appends the bars after each ticker's last_date to <name>_daily_features.csv and
+    merged_daily_features.csv. Tickers without a state file need a full run_pipeline first.
+    New merged rows go to the end of the file (after the per-ticker blocks).
+    """
+    merged_rows = []
+    for name, tkr in tickers.items():
+        spath = state_path(output_dir, name)
+        fpath = os.path.join(output_dir, f"{name}_daily_features.csv")
+        if not (os.path.exists(spath) and os.path.exists(fpath)):
+            print(f"[SKIP] {name}: no state/feature file, run run_pipeline first")
+            continue
+
+        missing = [c for c in FEATURE_COLUMNS if c not in pd.read_csv(fpath, nrows=0).columns]
+        if missing:
+            # Written by a feature-spec run: appended rows would not line up with the file's features
+            print(f"[SKIP] {name}: feature file lacks {len(missing)} streamed feature(s), run run_pipeline first")
+            continue
+
+        state = load_state(spath)
+        last = pd.Timestamp(state["last_date"])
+        raw = fetch_yahoo(tkr, last + pd.Timedelta(days=1))
+        if raw is not None and not raw.empty:
+            raw = raw[raw.index > last]
+        if raw is None or raw.empty:
+            print(f"[OK]  {name}: up to date ({state['last_date']})")
+            continue
+
+        rows = []
+        for date, bar in raw.iterrows():
+            row = {"date": date.strftime("%Y-%m-%d"), **bar.to_dict()}
+            row.update(update_state(state, date, bar))
+            row["ticker"], row["symbol"] = name, tkr
+            rows.append(row)
+
+        _append_rows(fpath, rows)
+        save_state(state, spath)
+        merged_rows.extend(rows)
+        print(f"[OK]  {name}: +{len(rows)} day(s) through {state['last_date']}")
+
+    merged_path = os.path.join(output_dir, "merged_daily_features.csv")
+    if merged_rows and os.path.exists(merged_path):
+        _append_rows(merged_path, merged_rows)
+        print(f"Appended {len(merged_rows)} rows to {merged_path}")
+
+if __name__ == "__main__":
+    update_pipeline(SYMBOL_MAP)
@@ -1,6 +1,10 @@
 from pathlib import Path
 from typing import Iterable, Iterator
+from scripts.utils.compact_frame import align_floats, compact_frame, memory_mb, report_memory
+from scripts.utils.manifest import Manifest, config_hash
+from scripts.utils import schema
 import pandas as pd
+import sys
 import re
 
 # ```
@@ -8,6 +12,7 @@ import re
 # - Scans INPUT_PATH (file or folder) for CSV files.
 # - Concatenates rows (union of columns), optionally adds source info, sorts/dedupes.
 # - Writes a single CSV (or set OUTPUT_EXT=".xlsx" to write Excel).
+# - Skips the merge when no input file and no setting changed since the last run (--force to rerun).
 # ```
 
 # ========= EDIT THESE =========
@@ -16,6 +21,8 @@ RECURSIVE = True                  # search subfolders if INPUT_PATH is a folder
 INCLUDE_PATTERNS = ["*.csv", "*.csv.gz"]  # which CSV extensions to include
 
 ADD_SOURCE_COLUMNS = False         # add 'source_file' column
+COMPACT = False                    # float32 numbers, categorical ticker/symbol, datetime64 date (less RAM)
+TYPED_READS = True                 # typed columns (scripts/utils/schema.py): ~7x less RAM than text, slower write
 DROP_DUPLICATES = False           # drop fully-duplicate rows after merge
 NATURAL_SORT_FILENAMES = True      #  e.g., file2 comes before file10
 
@@ -51,15 +58,23 @@ def iter_csv_files(base: Path, patterns: Iterable[str], recursive: bool) -> list
     return files
 
 
+def merge_settings() -> dict:
+    return {"patterns": INCLUDE_PATTERNS, "recursive": RECURSIVE, "source": ADD_SOURCE_COLUMNS,
+            "dedupe": DROP_DUPLICATES, "natural_sort": NATURAL_SORT_FILENAMES, "compact": COMPACT,
+            "output": str(OUTPUT_PATH)}
+
+
 def read_csv(fp: Path) -> pd.DataFrame | None:
     """
     Read CSV with robust defaults, preserving row order.
-    - dtype=str to avoid type drift across files
+    - typed columns where the values round-trip exactly (scripts/utils/schema.py); COMPACT reads text and
+      leaves the exact parse to compact_frame (the python engine's float parser can be off in the last digit)
     - sep=None + engine='python' to auto-detect delimiter
     - on_bad_lines='skip' to skip malformed lines
     """
     try:
-        df = pd.read_csv(fp, dtype=str, sep=None, engine="python", on_bad_lines="skip")
+        kw = dict(sep=None, engine="python", on_bad_lines="skip")
+        df = pd.read_csv(fp, dtype=str, **kw) if COMPACT else schema.read_csv(fp, typed=TYPED_READS, **kw)
         if ADD_SOURCE_COLUMNS:
             df = df.copy()
             df.insert(len(df.columns), "source_file", fp.name)
@@ -68,20 +83,45 @@ def read_csv(fp: Path) -> pd.DataFrame | None:
         print(f"[ERR] Failed to read: {fp} -> {e}")
         return None
 
+def unify_kinds(chunks: list[pd.DataFrame]) -> list[pd.DataFrame]:
+    # A column typed differently across files goes back to its text, so concat cannot reformat it (5 -> 5.0)
+    mixed = set()
+    for col in {c for df in chunks for c in df.columns}:
+        if len({schema.kind_of(df[col]) for df in chunks if col in df.columns}) > 1:
+            mixed.add(col)
+    if not mixed:
+        return chunks
+    return [df.assign(**{c: schema.as_text(df[c]) for c in mixed if c in df.columns}) for df in chunks]
+
 
 def main():
     base = INPUT_PATH.expanduser().resolve()
     files = iter_csv_files(base, INCLUDE_PATTERNS, RECURSIVE)
+    # The output can live inside INPUT_PATH; never merge it into itself
+    out_file = OUTPUT_PATH if OUTPUT_PATH.suffix.lower() == ".xlsx" else OUTPUT_PATH.with_suffix(".csv")
+    files = [f for f in files if f.resolve() != out_file.resolve()]
     if not files:
         print(f"[INFO] No CSV files found in {base}")
         return
 
+    manifest = Manifest("mergeAllTickers")
+    config = config_hash(merge_settings())
+    key = str(out_file.resolve())
+    if "--force" not in sys.argv and out_file.exists() and manifest.unchanged(key, files + [out_file], config):
+        print(f"[SKIP] {out_file}: inputs and settings unchanged since the last merge")
+        manifest.save()
+        return
+
     chunks: list[pd.DataFrame] = []
+    loaded_mb = 0.0
     for fp in files:
         df = read_csv(fp)
         if df is None or df.empty:
             print(f"[WARN] Empty or unreadable CSV skipped: {fp.name}")
             continue
+        if COMPACT:
+            loaded_mb += memory_mb(df)
+            df = compact_frame(df)
         chunks.append(df)
         print(f"[OK]  Loaded {len(df)} rows from {fp.name}")
 
@@ -89,7 +129,12 @@ def main():
         print("[INFO] Nothing to merge.")
         return
 
+    chunks = align_floats(chunks) if COMPACT else unify_kinds(chunks)
     merged = pd.concat(chunks, axis=0, ignore_index=True, sort=False)
+    if COMPACT:
+        # concat widens mixed float32/int columns and turns differing categories into text
+        merged = compact_frame(merged)
+        report_memory("merged (as read -> compact)", loaded_mb, memory_mb(merged))
     if DROP_DUPLICATES:
         before = len(merged)
         merged = merged.drop_duplicates(ignore_index=True)
@@ -103,7 +148,11 @@ def main():
                 merged.to_excel(w, index=False, sheet_name="merged")
         else:
             merged.to_csv(OUTPUT_PATH.with_suffix(".csv"), index=False)
+            if not COMPACT:
+                schema.remember(OUTPUT_PATH.with_suffix(".csv"), merged, typed=TYPED_READS)
         print(f"[DONE] Wrote {len(merged)} rows -> {OUTPUT_PATH}")
+        manifest.record(key, files + [out_file], config)
+        manifest.save()
     except Exception as e:
         print(f"[ERR] Write fail: {OUTPUT_PATH} -> {e}")
 
@@ -3,7 +3,14 @@
 
 from pathlib import Path
 from typing import Optional, Iterable
+from scripts.utils.compact_frame import compact_frame, memory_mb, report_memory
+from scripts.utils.manifest import Manifest, config_hash
+from scripts.utils.dates import parse_dates
+from scripts.utils.asof import asof
+from scripts.utils import schema
 import pandas as pd
+import hashlib
+import sys
 import os
 import re
 
@@ -23,11 +30,15 @@ TICKER_COL: Optional[str] = None         # set to "ticker" to merge on (date, ti
 
 # Join behavior
 JOIN_HOW = "left"                        # "left" or "inner"
+ASOF_JOIN = True                         # date-only files: last value on/before each base date (up to the file's
+                                         # last date), so series stored at native frequency need no daily expansion
 
 # Column handling
 ADD_PREFIX = True                        # prefix columns from each file
 FILE_ALIASES: dict[str, str] = {}        # optional overrides: {"BAA10Y_Spread.csv": "baa10y"}
 DROP_DUPLICATE_COLUMNS = True
+COMPACT = False                          # float32 numbers, categorical ticker/symbol, datetime64 dates (less RAM)
+TYPED_READS = True                       # typed columns (scripts/utils/schema.py): ~7x less RAM than text, slower write
 
 # CSV read options
 READ_KW = dict(dtype=str, sep=None, engine="python", on_bad_lines="skip")
@@ -39,15 +50,31 @@ OUTPUT_PATH = Path(r"data/merged_withIndicators.csv")
 # Common date column aliases (case-insensitive)
 DATE_ALIASES = {"date", "DATE", "observation_date", "time", "timestamp"}
 
+def merge_settings() -> dict:
+    # Everything that changes the output; with the same settings and inputs the merge is skipped (--force reruns)
+    return {"date_col": DATE_COL, "ticker_col": TICKER_COL, "how": JOIN_HOW, "asof": ASOF_JOIN, "prefix": ADD_PREFIX,
+            "aliases": FILE_ALIASES, "dedupe_cols": DROP_DUPLICATE_COLUMNS, "compact": COMPACT,
+            "read": READ_KW, "date_aliases": sorted(DATE_ALIASES)}
+
 def read_csv_robust(path: Path) -> pd.DataFrame:
+    # COMPACT reads text for compact_frame's exact parse; otherwise columns are typed where they round-trip exactly
+    kw = {k: v for k, v in READ_KW.items() if k != "dtype"}
     try:
-        return pd.read_csv(path, **READ_KW)
+        return pd.read_csv(path, dtype=str, **kw) if COMPACT else schema.read_csv(path, typed=TYPED_READS, **kw)
     except Exception as e:
         raise RuntimeError(f"Failed to read {path}: {e}")
 
 def normalize_date_series(s: pd.Series) -> pd.Series:
-    parsed = pd.to_datetime(s, errors="coerce", utc=False)
-    return parsed.dt.strftime("%Y-%m-%d")
+    # Join on datetime64 day values instead of date strings (to_csv still writes them as YYYY-MM-DD)
+    return parse_dates(s).dt.normalize()
+
+def compact_input(df: pd.DataFrame, label: str) -> pd.DataFrame:
+    if not COMPACT:
+        return df
+    before = memory_mb(df)
+    df = compact_frame(df, dates=())  # the date column is already normalized
+    report_memory(label, before, memory_mb(df))
+    return df
 
 def alias_for(path: Path) -> str:
     name = path.name
@@ -71,14 +98,16 @@ def coerce_date_column(df: pd.DataFrame, where: str) -> pd.DataFrame:
     )
 
 def drop_identical_duplicate_columns(df: pd.DataFrame) -> pd.DataFrame:
+    # Same dtype and values (5 and 5.0 differ, as in the written CSV); a content hash finds the candidates
     seen = {}
     to_drop = []
     for col in df.columns:
-        sig = (tuple(pd.isna(df[col])), tuple(df[col].fillna("__NA__")))
-        if sig in seen:
+        hashed = pd.util.hash_pandas_object(df[col], index=False).to_numpy()
+        key = hashlib.blake2b(hashed.tobytes(), digest_size=16).digest()
+        if any(df[c].equals(df[col]) for c in seen.get(key, [])):
             to_drop.append(col)
         else:
-            seen[sig] = col
+            seen.setdefault(key, []).append(col)
     if to_drop:
         df = df.drop(columns=to_drop)
         print(f"[INFO] Dropped {len(to_drop)} duplicate column(s): {to_drop}")
@@ -90,6 +119,15 @@ def merge_one(base: pd.DataFrame, add_df: pd.DataFrame, merge_on: list[str], ali
         add_df = add_df.rename(columns={c: f"{alias}__{c}" for c in right_cols})
         right_cols = [f"{alias}__{c}" for c in right_cols]
     add_view = add_df[merge_on + right_cols]
+    if ASOF_JOIN and merge_on == [DATE_COL]:
+        # Same as merging the daily forward-filled file, without materializing it
+        values, covered = asof(add_view, base[DATE_COL], DATE_COL)
+        clash = base.columns.intersection(right_cols)
+        if len(clash):  # suffixed like merge does (e.g. ADD_PREFIX=False and two files with a "value" column)
+            base = base.rename(columns={c: f"{c}_x" for c in clash})
+            values = values.rename(columns={c: f"{c}_y" for c in clash})
+        merged = pd.concat([base, values], axis=1, copy=False)
+        return merged if JOIN_HOW == "left" else merged.loc[covered].reset_index(drop=True)
     return base.merge(add_view, on=merge_on, how=JOIN_HOW, copy=False)
 
 def natural_key(s: str):
@@ -106,20 +144,7 @@ def list_input_csvs(folder: Path, patterns: Iterable[str], recursive: bool) -> l
     uniq = sorted({p.resolve() for p in files if p.is_file()}, key=lambda p: natural_key(str(p)))
     return uniq
 
-def main():
-    print("[INFO] CWD =", os.getcwd())
-
-    # Load and normalize base
-    base = read_csv_robust(BASE_CSV)
-    base = coerce_date_column(base, f"BASE_CSV ({BASE_CSV})").copy()
-    base[DATE_COL] = normalize_date_series(base[DATE_COL])
-
-    base_has_ticker = TICKER_COL is not None and TICKER_COL in base.columns
-    if base_has_ticker:
-        base[TICKER_COL] = base[TICKER_COL].astype(str)
-
-    print(f"[OK]  Loaded base: {BASE_CSV} with {len(base)} rows and {base.shape[1]} cols")
-
+def input_files() -> list[Path]:
     # Build file list from folder
     candidates = list_input_csvs(INPUT_DIR, INCLUDE_PATTERNS, RECURSIVE)
 
@@ -137,6 +162,33 @@ def main():
         if p.name in EXCLUDE_NAMES:
             continue
         files.append(p)
+    return files
+
+def main():
+    print("[INFO] CWD =", os.getcwd())
+
+    # Nothing to do when the base, every input file and the settings are as they were last time
+    files = input_files()
+    manifest = Manifest("mergeTickersToFredStatistics")
+    config = config_hash(merge_settings())
+    key = str(OUTPUT_PATH.resolve())
+    tracked = [BASE_CSV] + files + [OUTPUT_PATH]
+    if "--force" not in sys.argv and OUTPUT_PATH.exists() and manifest.unchanged(key, tracked, config):
+        print(f"[SKIP] {OUTPUT_PATH}: base, inputs and settings unchanged since the last merge")
+        manifest.save()
+        return
+
+    # Load and normalize base
+    base = read_csv_robust(BASE_CSV)
+    base = coerce_date_column(base, f"BASE_CSV ({BASE_CSV})").copy()
+    base[DATE_COL] = normalize_date_series(base[DATE_COL])
+
+    base_has_ticker = TICKER_COL is not None and TICKER_COL in base.columns
+    if base_has_ticker:
+        base[TICKER_COL] = base[TICKER_COL].astype(str)
+    base = compact_input(base, BASE_CSV.name)
+
+    print(f"[OK]  Loaded base: {BASE_CSV} with {len(base)} rows and {base.shape[1]} cols")
 
     if not files:
         print(f"[INFO] No CSV files found to merge in {INPUT_DIR}")
@@ -162,7 +214,7 @@ def main():
             if base_has_ticker and TICKER_COL not in add_df.columns:
                 print(f"[INFO] '{path.name}' has no '{TICKER_COL}'. Merging on date only.")
 
-        add_df = add_df.drop_duplicates()
+        add_df = compact_input(add_df.drop_duplicates(), path.name)
         before_cols = base.shape[1]
         al = alias_for(path)
         base = merge_one(base, add_df, merge_on, al)
@@ -171,9 +223,16 @@ def main():
     if DROP_DUPLICATE_COLUMNS:
         base = drop_identical_duplicate_columns(base)
 
+    if COMPACT:
+        print(f"[MEM] merged: {memory_mb(base):.1f} MB")
+
     OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
     base.to_csv(OUTPUT_PATH, index=False)
+    if not COMPACT:
+        schema.remember(OUTPUT_PATH, base, typed=TYPED_READS)
     print(f"[DONE] Wrote: {OUTPUT_PATH} with {len(base)} rows, {base.shape[1]} cols")
+    manifest.record(key, tracked, config)
+    manifest.save()
 
 if __name__ == "__main__":
     main()
@@ -1,18 +1,139 @@
-from scripts.constants.constants import START_DATE, END_DATE, INTERVAL
+from scripts.constants.constants import (
+    START_DATE, END_DATE, INTERVAL,
+    DOWNLOAD_CHUNK_SIZE, MIN_CHUNK_SIZE, MAX_CHUNK_SIZE, DOWNLOAD_TARGET_SECONDS,
+    DOWNLOAD_RETRIES, DOWNLOAD_BACKOFF, EMPTY_WINDOW_DAYS,
+)
+from collections import deque
+import pandas as pd
 import yfinance as yf
+import logging
 import time
+import ast
+import re
 
-def get_history(tickers):
+# yf.download catches per-ticker errors itself: it logs "['AAPL', 'MSFT']: <error>" and returns NaN columns
+ERROR_LINE = re.compile(r"(\[.*?\]): (.*)", re.DOTALL)
+NO_PRICES = ("no price data found", "possibly delisted", "no data found")
+
+class DownloadErrors(logging.Handler):
+    """Collects the per-ticker errors yf.download logs while it is attached: {ticker: message}."""
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.errors = {}
+
+    def emit(self, record):
+        m = ERROR_LINE.match(record.getMessage().strip())
+        if not m:
+            return
+        try:
+            tickers = ast.literal_eval(m.group(1))
+        except (ValueError, SyntaxError):
+            return
+        for ticker in tickers:
+            self.errors[str(ticker)] = m.group(2)
+
+def ticker_errors(chunk, download, **kw):
+    """Runs download(chunk, **kw); returns (frame, {ticker: error}) with the errors yfinance swallowed."""
+    handler = DownloadErrors()
+    logger = logging.getLogger("yfinance")
+    logger.addHandler(handler)
     try:
-        history = yf.download(
-            tickers,
-            start=START_DATE,
-            end=END_DATE,
-            interval=INTERVAL,
-            group_by='ticker',
-            threads=False
-        )
-        return history
-    except Exception as e:
-        print(f"Error fetching batch history: {e}")
-        return []
\ No newline at end of file
+        frame = download(chunk, **kw)
+    finally:
+        logger.removeHandler(handler)
+    errors = dict(handler.errors)
+    shared = getattr(getattr(yf, "shared", None), "_ERRORS", None) or {}  # older yfinance versions
+    errors.update({t: str(e) for t, e in shared.items() if t in chunk and t not in errors})
+    return frame, errors
+
+def no_new_bars(error, start, end):
+    # yfinance reports an empty window as missing prices; only a short window is plausibly just that
+    if error is None:
+        return True
+    short = pd.Timestamp(end) - pd.Timestamp(start) <= pd.Timedelta(days=EMPTY_WINDOW_DAYS)
+    return short and any(s in error.lower() for s in NO_PRICES)
+
+def download_chunk(chunk, start, end, download):
+    """
+    Downloads one batch and splits it into the usable frame, the tickers without
+    a single price in the window (up to date, or no bars yet) and the tickers
+    whose download failed (yfinance logged an error other than a short empty window).
+    An error for the whole batch raises.
+    """
+    frame, errors = ticker_errors(
+        chunk,
+        download,
+        start=start,
+        end=end,
+        interval=INTERVAL,
+        group_by='ticker',
+        threads=True
+    )
+    if frame is None or frame.empty:
+        frame = None
+    elif not isinstance(frame.columns, pd.MultiIndex):
+        # Older yfinance versions drop the ticker level for single-ticker batches
+        frame = pd.concat({chunk[0]: frame}, axis=1)
+
+    present = set(frame.columns.get_level_values(0)) if frame is not None else set()
+    ok = [t for t in chunk if t in present and frame[t].notna().any().any()]
+    rest = [t for t in chunk if t not in ok]
+    empty = [t for t in rest if no_new_bars(errors.get(t), start, end)]
+    failed = [t for t in rest if t not in empty]
+    for t in failed:
+        print(f"Error fetching {t}: {errors[t]}")
+    return (frame[ok] if ok else None), empty, failed
+
+def get_history(tickers, start=START_DATE, end=END_DATE, download=yf.download):
+    """
+    Fetches the universe in chunks whose size adapts to the last response:
+    slow or failing chunks halve it, quick clean ones grow it by half.
+    Tickers whose download failed (the whole chunk, or one ticker's error that
+    yfinance only logged) are retried in chunks of their own, after an exponential
+    backoff, and are dropped after DOWNLOAD_RETRIES attempts.
+    Tickers with no rows in the window and no error are done, not retried.
+    """
+    pending = list(tickers)
+    retries = deque()
+    attempts = {}
+    frames = []
+    size = DOWNLOAD_CHUNK_SIZE
+
+    while retries or pending:
+        if retries:
+            chunk = retries.popleft()
+        else:
+            chunk, pending = pending[:size], pending[size:]
+        t0 = time.monotonic()
+        try:
+            frame, empty, failed = download_chunk(chunk, start, end, download)
+        except Exception as e:
+            print(f"Error fetching batch history ({len(chunk)} tickers): {e}")
+            frame, empty, failed = None, [], chunk
+        elapsed = time.monotonic() - t0
+
+        if frame is not None:
+            frames.append(frame)
+        if empty:
+            print(f"No rows in the window for {len(empty)} ticker(s)")
+        if failed or elapsed > DOWNLOAD_TARGET_SECONDS:
+            size = max(MIN_CHUNK_SIZE, size // 2)
+        else:
+            size = min(MAX_CHUNK_SIZE, size + size // 2)
+
+        retry = []
+        for ticker in failed:
+            attempts[ticker] = attempts.get(ticker, 0) + 1
+            if attempts[ticker] <= DOWNLOAD_RETRIES:
+                retry.append(ticker)
+            else:
+                print(f"Giving up on {ticker} after {DOWNLOAD_RETRIES} retries")
+        if retry:
+            delay = DOWNLOAD_BACKOFF * 2 ** (max(attempts[t] for t in retry) - 1)
+            print(f"Retrying {len(retry)} ticker(s) in {delay}s")
+            time.sleep(delay)
+            retries.extend(retry[i:i + size] for i in range(0, len(retry), size))
+
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, axis=1)
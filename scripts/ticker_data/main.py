@@ -1,23 +1,31 @@
 from scripts.constants.constants import TICKER_DATA_DIR
-from scripts.ticker_data.process_ticker import process_ticker
-from scripts.utils.save_to_csv import save_to_csv
+from scripts.ticker_data.metadata_cache import TickerMetadataCache
+from scripts.ticker_data.update_history import update_history
 import pandas as pd
+import sys
+
+# Pass --full-refresh to re-download the whole window (e.g. after corporate actions)
+FULL_REFRESH = "--full-refresh" in sys.argv
+# Pass --refresh-names to drop the cached get_info names and look them all up again
+REFRESH_NAMES = "--refresh-names" in sys.argv
 
 if __name__ == "__main__":
 
+    if REFRESH_NAMES:
+        cache = TickerMetadataCache()
+        cache.invalidate()
+        cache.save()
+
     # Stocks
     stocks = pd.read_csv("data/tickers/stocks.csv")
-    stock_results = process_ticker(stocks['Ticker'].tolist())
-    save_to_csv(stock_results, "Stocks", TICKER_DATA_DIR)
+    update_history(stocks['Ticker'].tolist(), "Stocks", TICKER_DATA_DIR, FULL_REFRESH)
 
     # ETFs
     etfs = pd.read_csv("data/tickers/etfs.csv")
-    etf_results = process_ticker(etfs['Ticker'].tolist())
-    save_to_csv(etf_results, "ETFs", TICKER_DATA_DIR)
+    update_history(etfs['Ticker'].tolist(), "ETFs", TICKER_DATA_DIR, FULL_REFRESH)
 
     # Commodities
     commodities = pd.read_csv("data/tickers/commodities.csv")
-    commodity_results = process_ticker(commodities['Ticker'].tolist())
-    save_to_csv(commodity_results, "Commodities", TICKER_DATA_DIR)
+    update_history(commodities['Ticker'].tolist(), "Commodities", TICKER_DATA_DIR, FULL_REFRESH)
 
-    print("Scan is completed")
\ No newline at end of file
+    print("Scan is completed")
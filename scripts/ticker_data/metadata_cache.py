@@ -0,0 +1,46 @@
+from scripts.constants.constants import METADATA_CACHE_PATH, METADATA_TTL_DAYS
+import json
+import os
+import time
+
+class TickerMetadataCache:
+    """
+    On-disk cache of ticker names keyed by ticker: {"XOM": {"name": ..., "fetched": <unix time>}}.
+    Entries older than ttl_days count as missing, so only new or expired tickers hit the network.
+    """
+
+    def __init__(self, path=METADATA_CACHE_PATH, ttl_days=METADATA_TTL_DAYS):
+        self.path = path
+        self.ttl = ttl_days * 24 * 3600
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable metadata cache {path}: {e}")
+
+    def get(self, ticker):
+        # Returns (hit, name); a cached None name is still a hit
+        entry = self.entries.get(ticker)
+        if entry is None or time.time() - entry["fetched"] > self.ttl:
+            return False, None
+        return True, entry["name"]
+
+    def put(self, ticker, name):
+        self.entries[ticker] = {"name": name, "fetched": time.time()}
+
+    def invalidate(self, tickers=None):
+        # Drops the given tickers, or everything when tickers is None
+        if tickers is None:
+            self.entries.clear()
+        else:
+            for ticker in tickers:
+                self.entries.pop(ticker, None)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
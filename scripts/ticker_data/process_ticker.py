@@ -1,42 +1,74 @@
+from scripts.constants.constants import START_DATE, MAX_WORKERS, REQUESTS_PER_SECOND, RATE_LIMIT_RETRIES, RATE_LIMIT_BACKOFF
 from scripts.ticker_data.get_history import get_history
+from scripts.ticker_data.metadata_cache import TickerMetadataCache
+from scripts.ticker_data.reshape_history import reshape_history
+from scripts.utils.rate_limiter import TokenBucket
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import yfinance as yf
-import time
-
-def process_ticker(tickers):
-    history = get_history(tickers)
-    delay = 0.25
-    results = []
-    
-    for i, ticker in enumerate(tickers):
-        print(f"Processing {i+1}/{len(tickers)}: {ticker}")
-        
-        try:
-            time.sleep(delay)
-            stock = yf.Ticker(ticker)
-            info = stock.get_info()
-            time.sleep(delay)
-
-            # Basic
-            name = info.get("shortName") or info.get("longName")
-            ticker_history = history[ticker]
-
-            for date, row in ticker_history.iterrows():
-                results.append({
-                    # Basic
-                    "Date": date.strftime("%Y-%m-%d"),
-                    "Ticker": ticker,
-                    "Name": name,
-
-                    # Price
-                    "Price Open": row["Open"],
-                    "Price Close": row["Close"],
-                    "Price High": row["High"],
-                    "Price Low": row["Low"],
-                    "Volume": row["Volume"], 
-                })
 
+def yf_get_info(ticker):
+    return yf.Ticker(ticker).get_info()
+
+def is_rate_limited(error):
+    # yfinance raises YFRateLimitError; older versions only carry the HTTP message
+    return type(error).__name__ == "YFRateLimitError" or "Too Many Requests" in str(error)
+
+def fetch_name(ticker, limiter, get_info):
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        limiter.acquire()
+        try:
+            info = get_info(ticker)
         except Exception as e:
-            print(f"Error processing {ticker}: {e}")
-            continue
+            if is_rate_limited(e) and attempt < RATE_LIMIT_RETRIES:
+                print(f"Rate limited on {ticker}, backing off (attempt {attempt + 1}/{RATE_LIMIT_RETRIES})")
+                limiter.penalize(RATE_LIMIT_BACKOFF * 2 ** attempt)
+                continue
+            raise
+        return info.get("shortName") or info.get("longName")
+
+def process_ticker(tickers, start=START_DATE, max_workers=MAX_WORKERS, rate=REQUESTS_PER_SECOND, get_info=yf_get_info, cache=None):
+    """
+    Looks up ticker names concurrently (at most `rate` lookups per second across
+    all workers) and pairs them with the batch price history.
+    Names come from the metadata cache when present; only new or expired
+    tickers call get_info, which can be swapped for a stand-in that mimics yfinance.
+    """
+    history = get_history(tickers, start=start)
+    cache = TickerMetadataCache() if cache is None else cache
+    limiter = TokenBucket(rate)
+    names = {}
+
+    missing = []
+    for ticker in tickers:
+        hit, name = cache.get(ticker)
+        if hit:
+            names[ticker] = name
+        else:
+            missing.append(ticker)
+    print(f"Names: {len(tickers) - len(missing)} cached, {len(missing)} to look up")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(fetch_name, ticker, limiter, get_info): ticker for ticker in missing}
+
+        for i, future in enumerate(as_completed(futures)):
+            ticker = futures[future]
+            print(f"Processing {i+1}/{len(missing)}: {ticker}")
+
+            try:
+                # Basic
+                name = future.result()
+                cache.put(ticker, name)
+                names[ticker] = name
+
+            except Exception as e:
+                print(f"Error processing {ticker}: {e}")
+                continue
+
+    cache.save()
 
-    return results
\ No newline at end of file
+    # Keep the input order so the CSV layout does not depend on completion order
+    available = set(history.columns.get_level_values(0)) if len(history) else set()
+    for ticker in tickers:
+        if ticker in names and ticker not in available:
+            print(f"Error processing {ticker}: no price history")
+    return reshape_history(history, {t: names[t] for t in tickers if t in names and t in available})
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+COLUMNS = ["Date", "Ticker", "Name", "Price Open", "Price Close", "Price High", "Price Low", "Volume"]
+
+PRICE_FIELDS = {
+    "Price Open": "Open",
+    "Price Close": "Close",
+    "Price High": "High",
+    "Price Low": "Low",
+    "Volume": "Volume",
+}
+
+def reshape_history(history, names):
+    """
+    Turns the group_by='ticker' frame from yf.download into the long
+    Date, Ticker, Name, Price ... layout, one block of rows per ticker in the
+    order of `names` (ticker -> name).
+    Every (ticker, field) column is a contiguous array, so transposing the
+    wide block and flattening it yields ticker-major rows without a Python loop.
+    """
+    tickers = list(names)
+    if not tickers:
+        return pd.DataFrame(columns=COLUMNS)
+
+    n_dates = len(history.index)
+    out = {
+        "Date": np.tile(history.index.strftime("%Y-%m-%d").to_numpy(), len(tickers)),
+        "Ticker": np.repeat(np.array(tickers, dtype=object), n_dates),
+        "Name": np.repeat(np.array([names[t] for t in tickers], dtype=object), n_dates),
+    }
+    for column, field in PRICE_FIELDS.items():
+        block = history.loc[:, [(ticker, field) for ticker in tickers]]
+        # float64 like the per-row dicts, where iterrows upcasts Volume
+        out[column] = block.to_numpy(dtype="float64").T.ravel()
+
+    return pd.DataFrame(out, columns=COLUMNS)
@@ -0,0 +1,86 @@
+from scripts.constants.constants import START_DATE, END_DATE, UPDATE_BUCKET_DAYS
+from scripts.ticker_data.process_ticker import process_ticker
+from scripts.utils.save_to_csv import save_to_csv
+import pandas as pd
+import os
+
+def read_watermarks(filepath):
+    """
+    Returns the stored rows and the last date with a close price per ticker.
+    Trailing rows without prices are not counted, so they get fetched again.
+    """
+    if not os.path.exists(filepath):
+        return None, {}
+    stored = pd.read_csv(filepath, float_precision="round_trip")  # rewrite stored prices byte-for-byte
+    if stored.empty:
+        return None, {}
+    priced = stored.dropna(subset=["Price Close"])
+    watermarks = priced.groupby("Ticker")["Date"].max()
+    return stored, {ticker: pd.Timestamp(date) for ticker, date in watermarks.items()}
+
+def watermark_buckets(tickers, watermarks, days=UPDATE_BUCKET_DAYS):
+    """
+    Groups tickers whose watermarks lie within `days` of the bucket's oldest one.
+    Returns [(oldest watermark, tickers)], so one stale ticker only widens its own fetch.
+    """
+    buckets = []
+    for ticker in sorted(tickers, key=lambda t: watermarks[t]):
+        if buckets and watermarks[ticker] - buckets[-1][0] <= pd.Timedelta(days=days):
+            buckets[-1][1].append(ticker)
+        else:
+            buckets.append((watermarks[ticker], [ticker]))
+    return buckets
+
+def order_rows(df, tickers):
+    # Same layout as a full scan: one block per ticker in universe order, dates ascending
+    order = {ticker: i for i, ticker in enumerate(tickers)}
+    df = df.assign(_order=df["Ticker"].map(order))
+    df = df.sort_values(["_order", "Date"], kind="stable")
+    return df.drop(columns="_order").reset_index(drop=True)
+
+def update_history(tickers, category, dir, full_refresh=False):
+    """
+    Brings data/ticker_data/<category>.csv up to END_DATE.
+    Tickers already in the file are fetched from the day after their last stored
+    close, one fetch per UPDATE_BUCKET_DAYS bucket of watermarks; new tickers get
+    the full START_DATE window. full_refresh re-downloads
+    everything, e.g. after splits or dividends changed the adjusted history.
+    """
+    filepath = os.path.join(dir, f"{category}.csv")
+    stored, watermarks = (None, {}) if full_refresh else read_watermarks(filepath)
+
+    known = [t for t in tickers if t in watermarks]
+    new = [t for t in tickers if t not in watermarks]
+    fetched = []
+
+    if new:
+        print(f"{category}: full history for {len(new)} ticker(s)")
+        fetched.append(process_ticker(new, start=START_DATE))
+
+    up_to_date = 0
+    for oldest, bucket in watermark_buckets(known, watermarks):
+        start = oldest + pd.Timedelta(days=1)
+        if start >= END_DATE:
+            up_to_date += len(bucket)
+            continue
+        print(f"{category}: {len(bucket)} ticker(s) from {start:%Y-%m-%d}")
+        rows = process_ticker(bucket, start=start)
+        if not rows.empty:
+            # The batch starts at the bucket's oldest watermark; drop bars other tickers already have
+            last = rows["Ticker"].map(watermarks)
+            rows = rows[pd.to_datetime(rows["Date"]) > last]
+        fetched.append(rows)
+    if up_to_date:
+        print(f"{category}: {up_to_date} ticker(s) up to date")
+
+    frames = [f for f in fetched if not f.empty]
+    if stored is not None:
+        stored = stored[stored["Ticker"].isin(tickers)]
+        frames.insert(0, stored)
+    if not frames:
+        print(f"{category}: nothing to save")
+        return
+
+    merged = pd.concat(frames, ignore_index=True)
+    merged = merged.drop_duplicates(subset=["Date", "Ticker"], keep="last")
+    save_to_csv(order_rows(merged, tickers), category, dir)
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+#```
+# As-of ("last known value") reads of a series stored at its native frequency, instead of
+# materializing one row per day with reindex + ffill.
+# A stored series only needs its observation rows; asof(series, dates) gives, for every date, the
+# values of the last row on or before it, up to the series' last row (like the daily ffill, which
+# never ran past the last observation). Missing cells take the last value known in that column.
+#```
+
+def observations(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    df (sorted, one row per date) without the rows that only repeat the row before.
+    Reading the rest as-of gives df back; the last row is kept since it marks where the series ends.
+    """
+    if len(df) < 2:
+        return df
+    filled = df.ffill()
+    prev = filled.shift()
+    same = (filled.eq(prev) | (filled.isna() & prev.isna())).all(axis=1).to_numpy()
+    same[0] = same[-1] = False
+    return df.loc[~same]
+
+def asof(df: pd.DataFrame, dates: pd.Series, date_col: str) -> tuple[pd.DataFrame, np.ndarray]:
+    """
+    The value columns of df (dates in date_col) as of each of dates, aligned to dates' index.
+    Also returns the mask of dates the series covers (on or after its first row, up to its last);
+    the other rows are missing. dates and df[date_col] are datetime64 days (NaT never matches).
+    """
+    df = df.loc[df[date_col].notna()]
+    df = df.drop_duplicates(subset=date_col, keep="last").sort_values(date_col, kind="stable")
+    values = df.drop(columns=[date_col]).ffill().reset_index(drop=True)
+
+    keys = df[date_col].to_numpy(dtype="datetime64[ns]")
+    want = dates.to_numpy(dtype="datetime64[ns]")
+    pos = keys.searchsorted(want, side="right") - 1
+    covered = pd.notna(want) & (pos >= 0)
+    if len(keys):
+        covered &= want <= keys[-1]
+    pos[~covered] = -1  # reindex leaves these rows missing
+
+    out = values.reindex(pos)
+    out.index = dates.index
+    return out, covered
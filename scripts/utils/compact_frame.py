@@ -0,0 +1,96 @@
+from typing import Iterable
+import numpy as np
+import pandas as pd
+from scripts.utils.dates import parse_dates
+from scripts.utils import schema
+
+#```
+# Opt-in compact dtypes for the wide feature/merged frames:
+# - float32 for float columns whose values float32 keeps digit for digit (to_csv writes the same text);
+#   others stay float64 (e.g. FRED levels like 1523456.78 would lose the cents)
+# - exact_floats=False casts the float columns to float32 regardless (~7 significant digits). Computed
+#   indicators never fit exactly, so build_features(compact=True) takes that loss for half the memory.
+# - category for ticker/symbol, which repeat the same few strings on every row
+# - datetime64 for dates; integer columns are downcast losslessly
+# Text columns read with dtype=str are converted when every value is a number that writes back as the
+# same text (the typed-read rules of scripts/utils/schema.py), so compacting never changes a written CSV.
+#```
+
+CATEGORY_COLUMNS = ("ticker", "symbol")
+DATE_COLUMNS = ("date",)
+FLOAT32_SAMPLE = 1000          # distinct values checked first; most columns that do not fit fail here
+
+def memory_mb(df: pd.DataFrame) -> float:
+    return df.memory_usage(deep=True).sum() / 1e6
+
+def report_memory(label: str, before: float, after: float) -> None:
+    saved = 100 * (1 - after / before) if before else 0.0
+    print(f"[MEM] {label}: {before:.1f} MB -> {after:.1f} MB ({saved:.0f}% less)")
+
+def _numeric(s: pd.Series) -> pd.Series | None:
+    # Numbers parsed from a text column, or None unless every value is one that writes back as its text
+    kind = schema.infer_kind(s)
+    return schema.convert(s, kind) if kind in ("int", "float") else None
+
+def _same_digits(values: np.ndarray) -> bool:
+    return bool((values.astype("float32").astype(str) == values.astype(str)).all())
+
+def fits_float32(s: pd.Series) -> bool:
+    """True when float32 holds every value of s with the same shortest digits as float64."""
+    values = pd.unique(s.dropna().to_numpy(dtype="float64"))
+    return _same_digits(values[:FLOAT32_SAMPLE]) and _same_digits(values)
+
+def widen(s: pd.Series) -> pd.Series:
+    """A float32 column from compact_frame back at the float64 values it had (through its digits)."""
+    return pd.Series(s.to_numpy().astype(str).astype("float64"), index=s.index, name=s.name)
+
+def align_floats(frames: list[pd.DataFrame]) -> list[pd.DataFrame]:
+    """
+    frames ready for pd.concat: a column that is float32 in some frames and not in others goes
+    back to float64 in all of them, since concat would widen the float32 values with extra digits.
+    """
+    dtypes: dict[str, set] = {}
+    for frame in frames:
+        for col, dtype in frame.dtypes.items():
+            dtypes.setdefault(col, set()).add(dtype)
+    mixed = [col for col, kinds in dtypes.items() if np.dtype("float32") in kinds and len(kinds) > 1]
+    if not mixed:
+        return frames
+    return [frame.assign(**{c: widen(frame[c]) for c in mixed if c in frame and frame[c].dtype == "float32"})
+            for frame in frames]
+
+def compact_frame(
+    df: pd.DataFrame,
+    floats: Iterable[str] | None = None,
+    categories: Iterable[str] = CATEGORY_COLUMNS,
+    dates: Iterable[str] = DATE_COLUMNS,
+    exact_floats: bool = True,
+) -> pd.DataFrame:
+    """
+    Returns a copy of df with compact dtypes.
+    floats: columns to store as float32 where they fit (default: every float or numeric-text column);
+    with exact_floats=False every float column among them, rounding values float32 cannot hold.
+    Columns listed in categories/dates are converted when present.
+    """
+    out = df.copy()
+    categories, dates = set(categories), set(dates)
+    targets = set(out.columns) if floats is None else set(floats)
+
+    for col in out.columns:
+        s = out[col]
+        if col in dates:
+            if not pd.api.types.is_datetime64_any_dtype(s):
+                out[col] = parse_dates(s)
+        elif col in categories:
+            out[col] = s.astype("category")
+        elif col in targets:
+            if s.dtype == object:
+                parsed = _numeric(s)
+                if parsed is None:
+                    continue
+                s = parsed
+            if pd.api.types.is_float_dtype(s):
+                out[col] = s.astype("float32") if not exact_floats or fits_float32(s) else s
+            elif pd.api.types.is_integer_dtype(s):
+                out[col] = pd.to_numeric(s, downcast="integer")
+    return out
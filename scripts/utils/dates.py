@@ -0,0 +1,53 @@
+from pandas.tseries.api import guess_datetime_format
+import warnings
+import pandas as pd
+
+#```
+# Shared date parsing for the cleanup and merge scripts.
+# - the format is detected once per column, from its first value (what pandas' own inference does)
+# - only the unique strings are parsed; the result is mapped back onto every row
+# - values come back as datetime64 so later steps can keep them instead of re-parsing strings
+# - ISO output is numpy's datetime64[D] text, much cheaper than strftime when most dates are distinct
+#   (a cleaned FRED file has one row per day)
+# Unparsable values become NaT. A first value with no recognizable format falls back to
+# pandas' per-value parser, as pd.to_datetime does.
+#```
+
+ISO_DATE = "%Y-%m-%d"
+
+def detect_format(values: pd.Series) -> str | None:
+    first = values.dropna()
+    if first.empty:
+        return None
+    return guess_datetime_format(str(first.iloc[0]))
+
+def parse_dates(values: pd.Series, fmt: str | None = None) -> pd.Series:
+    """
+    Parses a column of date strings to datetime64, like
+    pd.to_datetime(values, errors="coerce") but once per distinct value.
+    fmt overrides the detected format. Columns that are already datetime64 are returned as they are.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    codes, uniques = pd.factorize(values)
+    if fmt is None and len(uniques):
+        fmt = guess_datetime_format(str(uniques[0]))  # uniques skip missing values, in order of appearance
+    with warnings.catch_warnings():
+        # No detectable format: pandas warns before parsing value by value
+        warnings.simplefilter("ignore", UserWarning)
+        parsed = pd.to_datetime(pd.Index(uniques), format=fmt, errors="coerce")
+    out = parsed.take(codes, allow_fill=True, fill_value=pd.NaT)
+    return pd.Series(out, index=values.index, name=values.name)
+
+def format_dates(dates: pd.Series, fmt: str = ISO_DATE) -> pd.Series:
+    # strftime on the distinct dates only; NaT stays missing
+    codes, uniques = pd.factorize(dates)
+    if len(uniques) == 0:
+        return pd.Series(None, index=dates.index, name=dates.name, dtype=object)
+    uniques = pd.DatetimeIndex(uniques)
+    if fmt == ISO_DATE and uniques.tz is None:
+        text = uniques.to_numpy(dtype="datetime64[D]").astype(str).astype(object)
+    else:
+        text = uniques.strftime(fmt).to_numpy(dtype=object)
+    out = pd.Series(text[codes], index=dates.index, name=dates.name, dtype=object)
+    return out.where(codes >= 0)
@@ -0,0 +1,105 @@
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import requests
+import threading
+import hashlib
+import json
+
+#```
+# Shared download layer for the standalone scripts:
+# - one keep-alive Session with a connection pool and retry/backoff
+# - conditional GETs (ETag / If-Modified-Since) against a local response cache,
+#   so a source that did not change answers 304 and is skipped
+#```
+
+# -------- Settings --------
+CACHE_DIR = Path("data/.http_cache")
+TIMEOUT = 30
+RETRIES = 3
+BACKOFF = 2                  # urllib3 backoff factor: 2s, 4s, 8s between retries
+POOL_SIZE = 10
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/128.0.0.0 Safari/537.36"
+    )
+}
+# --------------------------
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session() -> requests.Session:
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=RETRIES,
+                backoff_factor=BACKOFF,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=("GET", "HEAD"),
+            )
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+def _cache_paths(url: str) -> tuple[Path, Path]:
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:24]
+    return CACHE_DIR / f"{key}.body", CACHE_DIR / f"{key}.json"
+
+def fetch(url: str, headers: dict | None = None, timeout: int = TIMEOUT) -> tuple[bytes, bool]:
+    """
+    GET url through the shared session.
+    Returns (content, changed). changed is False when the server answered 304
+    or sent back the same bytes as the cached copy.
+    """
+    body_path, meta_path = _cache_paths(url)
+    meta = {}
+    if body_path.exists() and meta_path.exists():
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+
+    req_headers = dict(headers or {})
+    if meta.get("etag"):
+        req_headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        req_headers["If-Modified-Since"] = meta["last_modified"]
+
+    r = get_session().get(url, headers=req_headers, timeout=timeout)
+    if r.status_code == 304 and meta:
+        return body_path.read_bytes(), False
+    r.raise_for_status()
+
+    # Servers without validators still resend identical bodies; compare hashes
+    digest = hashlib.sha256(r.content).hexdigest()
+    changed = digest != meta.get("sha256")
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    body_path.write_bytes(r.content)
+    meta_path.write_text(json.dumps({
+        "url": url,
+        "etag": r.headers.get("ETag"),
+        "last_modified": r.headers.get("Last-Modified"),
+        "sha256": digest,
+    }, indent=2), encoding="utf-8")
+    return r.content, changed
+
+def download(url: str, outpath: Path, headers: dict | None = None) -> bool:
+    """
+    Saves url to outpath. Returns False (and leaves the file alone) when the
+    source is unchanged and outpath already exists.
+    """
+    outpath = Path(outpath)
+    content, changed = fetch(url, headers=headers)
+    if not changed and outpath.exists():
+        print(f"Unchanged: {outpath.resolve()}")
+        return False
+    outpath.parent.mkdir(parents=True, exist_ok=True)
+    outpath.write_bytes(content)
+    print(f"Saved: {outpath.resolve()}")
+    return True
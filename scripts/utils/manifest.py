@@ -0,0 +1,103 @@
+from pathlib import Path
+from typing import Callable, Iterable
+from scripts.utils.parallel_files import run_in_order
+import hashlib
+import json
+import os
+
+#```
+# Skip-unchanged bookkeeping for the cleanup and merge stages.
+# A manifest (data/.manifest/<stage>.json) remembers, per entry, the files it read/wrote and a hash
+# of the stage settings. An entry is unchanged when the settings hash matches and every file still
+# has the recorded content: size + mtime equal -> same file without reading it, otherwise the
+# sha256 decides (a touched-but-identical file still counts as unchanged).
+#```
+
+MANIFEST_DIR = Path("data/.manifest")
+HASH_CHUNK = 1 << 20
+
+def config_hash(settings: dict) -> str:
+    blob = json.dumps(settings, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_CHUNK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def file_signature(path: Path) -> dict:
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": file_sha256(path)}
+
+class Manifest:
+    def __init__(self, stage: str, directory: Path = MANIFEST_DIR):
+        self.path = Path(directory) / f"{stage}.json"
+        self.entries = {}
+        if self.path.exists():
+            try:
+                self.entries = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable manifest {self.path}: {e}")
+
+    def _same_file(self, path: Path, sig: dict) -> bool:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        if st.st_size != sig["size"]:
+            return False
+        if st.st_mtime_ns == sig["mtime_ns"]:
+            return True
+        if file_sha256(path) != sig["sha256"]:
+            return False
+        sig["mtime_ns"] = st.st_mtime_ns  # same bytes, newer mtime: remember it for the fast path
+        return True
+
+    def unchanged(self, key: str, files: Iterable[Path], config: str) -> bool:
+        entry = self.entries.get(key)
+        files = [str(Path(f).resolve()) for f in files]
+        if entry is None or entry["config"] != config or sorted(entry["files"]) != sorted(files):
+            return False
+        return all(self._same_file(Path(f), entry["files"][f]) for f in files)
+
+    def record(self, key: str, files: Iterable[Path], config: str):
+        self.entries[key] = {
+            "config": config,
+            "files": {str(Path(f).resolve()): file_signature(Path(f)) for f in files if Path(f).exists()},
+        }
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.tmp")
+        tmp.write_text(json.dumps(self.entries, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+def run_changed(stage: str, fn: Callable, calls: list[tuple], settings: dict | Callable[[tuple], dict],
+                jobs: int = 1, force: bool = False):
+    """
+    run_in_order(fn, calls, jobs) for the calls whose file (args[0]) or settings changed since the
+    last run of `stage`. settings is one dict for every call, or a function of the call.
+    force=True runs everything and refreshes the manifest. Calls that fail (fn raises, or returns
+    False after reporting the error itself) are not recorded, so the next run retries them.
+    """
+    manifest = Manifest(stage)
+    settings_of = settings if callable(settings) else (lambda call: settings)
+    todo = []
+    for call in calls:
+        config = config_hash(settings_of(call))
+        if force or not manifest.unchanged(str(Path(call[0]).resolve()), [call[0]], config):
+            todo.append((call, config))
+    if len(todo) < len(calls):
+        print(f"[SKIP] {len(calls) - len(todo)} unchanged file(s) ({stage} manifest)")
+
+    failed = run_in_order(fn, [call for call, _ in todo], jobs)
+    for call, config in todo:
+        key = str(Path(call[0]).resolve())
+        if call in failed:
+            manifest.entries.pop(key, None)  # retried next run
+        else:
+            # The file as this run left it is the input the next run compares against
+            manifest.record(key, [call[0]], config)
+    manifest.save()
@@ -0,0 +1,35 @@
+from typing import Callable
+import numpy as np
+import pandas as pd
+
+#```
+# NA-token handling shared by the cleanup scripts: map_text runs a rule over the text cells of a column
+# as one numpy string array (np.strings ufuncs, numpy >= 2) instead of a Python call per cell.
+# Columns the rule does not change are left as they are.
+# (Matching tokens at read time with read_csv(na_values=...) was tried: any na_values list made
+# parsing slower than what it saved here.)
+#```
+
+def map_text(s: pd.Series, rule: Callable[[np.ndarray], tuple[np.ndarray, np.ndarray]]) -> pd.Series | None:
+    """
+    rule(text) -> (new_text, is_na) for the str cells of s, as numpy str arrays / a bool mask.
+    Returns s with is_na cells set to NA and the other changes applied, or None when nothing changes.
+    Cells that are not str (missing, numbers from Excel) are left as they are.
+    """
+    values = s.to_numpy(dtype=object)
+    if pd.api.types.infer_dtype(values, skipna=True) == "string":
+        is_text = pd.notna(values)
+    else:
+        is_text = np.fromiter((isinstance(v, str) for v in values), bool, len(values))
+    if not is_text.any():
+        return None
+    text = values[is_text].astype(str)
+    new, is_na = rule(text)
+    changed = is_na | (new != text)
+    if not changed.any():
+        return None
+    out = values.copy()
+    rows = np.flatnonzero(is_text)[changed]
+    out[rows] = new[changed].astype(object)
+    out[rows[is_na[changed]]] = pd.NA
+    return pd.Series(out, index=s.index, name=s.name, dtype=object)
@@ -0,0 +1,64 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from typing import Callable, Iterable
+import traceback
+import io
+import os
+
+#```
+# Per-file parallelism for the cleanup scripts (--jobs N).
+# Every call runs in a worker process with its stdout captured; the main process prints the
+# captured logs in input order, so the output reads like a sequential run. A file that raises
+# is reported and the others still run; fn returning False marks a failure it already reported.
+#```
+
+def jobs_arg(argv: list[str]) -> tuple[int, list[str]]:
+    """
+    Pulls "--jobs N" out of argv. Returns (jobs, remaining argv).
+    --jobs 0 means one worker per CPU; without the flag the scripts stay sequential.
+    """
+    if "--jobs" not in argv:
+        return 1, argv
+    i = argv.index("--jobs")
+    jobs = int(argv[i + 1])
+    return (jobs or os.cpu_count() or 1), argv[:i] + argv[i + 2:]
+
+def _captured(fn: Callable, args: tuple) -> tuple[str, str | None, bool]:
+    out = io.StringIO()
+    try:
+        with redirect_stdout(out):
+            ok = fn(*args) is not False
+    except Exception:
+        return out.getvalue(), traceback.format_exc(), False
+    return out.getvalue(), None, ok
+
+def run_in_order(fn: Callable, calls: Iterable[tuple], jobs: int = 1) -> list[tuple]:
+    """
+    Runs fn(*args) for every args tuple in calls, on up to `jobs` processes.
+    Logs are printed in call order. Returns the calls that raised or returned False.
+    """
+    calls = list(calls)
+    failures = []
+    if jobs <= 1 or len(calls) <= 1:
+        for args in calls:
+            try:
+                if fn(*args) is False:
+                    failures.append(args)
+            except Exception as e:
+                failures.append(args)
+                print(f"[ERR] {args[0]}: {e}")
+        return failures
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(calls))) as pool:
+        futures = [pool.submit(_captured, fn, args) for args in calls]
+        for args, future in zip(calls, futures):
+            try:
+                log, error, ok = future.result()
+            except Exception as e:  # the worker itself died (e.g. out of memory)
+                log, error, ok = "", f"{type(e).__name__}: {e}", False
+            print(log, end="")
+            if not ok:
+                failures.append(args)
+            if error:
+                print(f"[ERR] {args[0]}: {error.strip().splitlines()[-1]}")
+    return failures
@@ -0,0 +1,195 @@
+from pathlib import Path
+from scripts.utils.manifest import MANIFEST_DIR
+from scripts.utils.dates import ISO_DATE, format_dates
+import pandas as pd
+import numpy as np
+import json
+import csv
+import os
+import re
+
+#```
+# Typed CSV reads for the cleanup and merge scripts, instead of dtype=str everywhere.
+# Column kinds: float (float64), int (Int64), date (datetime64), category, str.
+# A column only gets a kind whose values pandas writes back exactly as they are in the file
+# ("1.50", "007" or "5" in a float column stay text), so writing a typed frame gives the same CSV.
+# Kinds are cached per file family (the folder, data/.manifest/schema/<family>.json):
+# - a file seen before with the same size + mtime is read straight into its cached dtypes
+# - any other file is read as text once, checked column by column (the family's kind is tried first)
+#   and converted in memory
+# remember(path, df) records a file a script just wrote from a typed frame, so the next step's
+# read takes the fast path.
+# sep=None (the python engine's delimiter sniffing) is resolved up front and the file read by the C
+# engine: the python engine holds every cell as a string first, which costs what the typed read saves.
+# Typed reads cut memory ~7x on the merged indicator file, but to_csv formats floats far slower than
+# it writes text. The merges (many files read, one written) pass typed=True; the cleanup steps rewrite
+# every file they read and run ~2x longer typed (same output), so they follow TYPED_READS (off = dtype=str).
+# dataDropEmptyRows and cleanupPipeline's drop step read text regardless: their NA tokens are not pandas'.
+#```
+
+TYPED_READS = False            # default of read_csv/remember's `typed`
+SCHEMA_DIR = MANIFEST_DIR / "schema"
+CATEGORY_MAX_SHARE = 0.01      # text column with at most 1% distinct values -> category
+
+INT_RE = re.compile(r"-?(?:0|[1-9][0-9]*)")
+DATE_RE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
+DTYPES = {"float": "float64", "int": "Int64", "category": "category", "str": str}
+
+def family_of(path: Path) -> str:
+    return Path(path).resolve().parent.name or "root"
+
+def _load(family: str) -> dict:
+    path = SCHEMA_DIR / f"{family}.json"
+    if path.exists():
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            pass
+    return {"kinds": {}, "files": {}}
+
+def _save(family: str, schema: dict):
+    SCHEMA_DIR.mkdir(parents=True, exist_ok=True)
+    path = SCHEMA_DIR / f"{family}.json"
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")  # --jobs workers update the same family
+    tmp.write_text(json.dumps(schema, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+def _signature(path: Path) -> dict:
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+def _floats(s: pd.Series) -> np.ndarray:
+    # Exact (correctly rounded) parse; pd.to_numeric can be off in the last digit
+    return s.to_numpy(dtype=object).astype("float64")
+
+def _round_trips(kind: str, text: pd.Series) -> bool:
+    # text: the distinct non-null strings of a column
+    if kind == "float":
+        try:
+            values = _floats(text)
+        except ValueError:
+            return False
+        return bool((values.astype(str) == text.to_numpy()).all())
+    if kind == "int":
+        if not text.str.fullmatch(INT_RE.pattern).all():
+            return False
+        return pd.to_numeric(text, errors="coerce").between(-2**63, 2**63 - 1).all()
+    if kind == "date":
+        if not text.str.fullmatch(DATE_RE.pattern).all():
+            return False
+        parsed = pd.to_datetime(text, format=ISO_DATE, errors="coerce")
+        return bool(parsed.notna().all())
+    return True  # category/str keep the text itself
+
+def infer_kind(values: pd.Series, hint: str | None = None) -> str:
+    """Kind of a text column (hint: the family's kind, tried first)."""
+    text = pd.Series(values.dropna().unique(), dtype=object)
+    if text.empty:
+        return hint or "str"
+    if hint and _round_trips(hint, text):
+        if hint != "category" or len(text) <= CATEGORY_MAX_SHARE * values.notna().sum():
+            return hint
+    for kind in ("int", "float", "date"):
+        if _round_trips(kind, text):
+            return kind
+    return "category" if len(text) <= CATEGORY_MAX_SHARE * values.notna().sum() else "str"
+
+def convert(s: pd.Series, kind: str) -> pd.Series:
+    if kind == "date":
+        return pd.to_datetime(s, format=ISO_DATE)
+    if kind == "int":
+        return pd.to_numeric(s, dtype_backend="numpy_nullable").astype("Int64")  # no detour through float
+    if kind == "float":
+        return pd.Series(_floats(s), index=s.index, name=s.name)
+    if kind == "category":
+        return s.astype("category")
+    return s
+
+def kind_of(s: pd.Series) -> str:
+    # The kind a column written by to_csv reads back as
+    if pd.api.types.is_float_dtype(s) and s.dtype == "float64":
+        return "float"
+    if pd.api.types.is_integer_dtype(s):
+        return "int"
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return "category"
+    if pd.api.types.is_datetime64_dtype(s):
+        dated = s.dropna()
+        return "date" if (dated == dated.dt.normalize()).all() else "str"
+    return "str"
+
+def as_text(s: pd.Series) -> pd.Series:
+    """s as the strings to_csv writes for it (missing stays missing)."""
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return format_dates(s, ISO_DATE) if kind_of(s) == "date" else s.astype(object).where(s.notna())
+    if s.dtype == object:
+        return s
+    return s.astype(str).where(s.notna()).astype(object)
+
+def _sniffed(path: Path, kw: dict) -> dict:
+    # kw with sep=None replaced by the delimiter csv.Sniffer finds in the first line, as pandas does
+    if "sep" not in kw or kw["sep"] is not None:
+        return kw
+    with open(path, newline="", encoding=kw.get("encoding")) as f:
+        first = f.readline()
+    try:
+        sep = csv.Sniffer().sniff(first).delimiter
+    except csv.Error:
+        return kw  # let pandas report it
+    return {**kw, "sep": sep, "engine": "c"}
+
+def read_csv(path: Path, typed: bool | None = None, **kw) -> pd.DataFrame:
+    """
+    pd.read_csv(path, **kw) with typed columns (see the header); kw must not set dtype.
+    typed=False reads text (dtype=str); None follows TYPED_READS.
+    """
+    if not (TYPED_READS if typed is None else typed):
+        return pd.read_csv(path, dtype=str, **kw)
+
+    path = Path(path)
+    kw = _sniffed(path, kw)
+    family = family_of(path)
+    schema = _load(family)
+    key = str(path.resolve())
+    entry = schema["files"].get(key)
+    if entry and {k: entry[k] for k in ("size", "mtime_ns")} == _signature(path):
+        kinds = entry["kinds"]
+        dates = [c for c, k in kinds.items() if k == "date"]
+        dtype = {c: DTYPES[k] for c, k in kinds.items() if k != "date"}
+        c_engine = kw.get("engine", "c") == "c"
+        read_kw = {"float_precision": "round_trip", **kw} if c_engine else kw  # default C parser: off by 1 ulp
+        if not c_engine:
+            dtype.update({c: str for c, k in kinds.items() if k == "float"})  # the python engine is not exact
+        try:
+            df = pd.read_csv(path, dtype=dtype, parse_dates=dates, date_format=ISO_DATE, **read_kw)
+            if not c_engine:
+                for c in [c for c, k in kinds.items() if k == "float"]:
+                    df[c] = convert(df[c], "float")
+            return df
+        except (ValueError, TypeError):
+            pass  # cache out of date after all: check the file again
+
+    df = pd.read_csv(path, dtype=str, **kw)
+    kinds = {}
+    for col in df.columns:
+        kinds[col] = infer_kind(df[col], schema["kinds"].get(col))
+        df[col] = convert(df[col], kinds[col])
+
+    schema = _load(family)  # another worker may have saved meanwhile
+    schema["kinds"].update(kinds)
+    schema["files"][key] = {**_signature(path), "kinds": kinds}
+    _save(family, schema)
+    return df
+
+def remember(path: Path, df: pd.DataFrame, typed: bool | None = None):
+    """Records path as just written from df, so the next typed read_csv uses df's dtypes."""
+    if not (TYPED_READS if typed is None else typed) or not Path(path).exists():
+        return
+    path = Path(path)
+    family = family_of(path)
+    kinds = {col: kind_of(df[col]) for col in df.columns}
+    if len(set(kinds)) != len(df.columns):
+        return  # duplicate names: pandas renames them on read
+    schema = _load(family)
+    schema["files"][str(path.resolve())] = {**_signature(path), "kinds": kinds}
+    _save(family, schema)
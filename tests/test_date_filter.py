@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+
+import scripts.dataCleanup.dataDiscardFromToDate as ddf
+
+def ticker_blocks(tickers, start="1998-01-01", end="2026-12-31"):
+    # Like merged_withIndicators.csv: one block per ticker, dates ascending within each block only
+    days = pd.date_range(start, end, freq="7D").strftime("%Y-%m-%d")
+    return pd.concat([pd.DataFrame({"date": days, "ticker": t, "close": range(len(days))}) for t in tickers],
+                     ignore_index=True)
+
+def filtered(path, df, chunk_rows, assume_sorted):
+    df.to_csv(path, index=False)
+    ddf.CHUNK_ROWS, ddf.ASSUME_SORTED = chunk_rows, assume_sorted
+    ddf.filter_by_date(path)
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch):
+    monkeypatch.setattr(ddf, "OVERWRITE", True)
+    monkeypatch.setattr(ddf, "DROP_UNPARSABLE", True)
+    monkeypatch.setattr(ddf, "CHUNK_ROWS", None)
+    monkeypatch.setattr(ddf, "ASSUME_SORTED", False)
+
+@pytest.mark.parametrize("df", [
+    ticker_blocks(["AAA"]),
+    ticker_blocks(["AAA", "BBB", "CCC"]),
+    ticker_blocks(["AAA", "BBB"]).sample(frac=1, random_state=0),
+    ticker_blocks(["AAA"]).iloc[:0],
+], ids=["sorted", "sorted per ticker block", "shuffled", "header only"])
+@pytest.mark.parametrize("assume_sorted", [False, True])
+def test_chunked_filter_keeps_what_the_in_memory_filter_keeps(tmp_path, df, assume_sorted):
+    path = tmp_path / "prices.csv"
+    want = filtered(path, df, None, False)
+    got = filtered(path, df, 100, assume_sorted)
+
+    pd.testing.assert_frame_equal(got, want)
+
+def test_block_sorted_file_is_read_in_full(tmp_path, capsys):
+    path = tmp_path / "merged.csv"
+    df = ticker_blocks(["AAA", "BBB"])
+    got = filtered(path, df, 100, True)
+
+    assert set(got["ticker"]) == {"AAA", "BBB"}
+    assert "not sorted overall" in capsys.readouterr().out
@@ -0,0 +1,72 @@
+from yfinance import utils as yf_utils
+import numpy as np
+import pandas as pd
+import pytest
+
+import scripts.ticker_data.get_history as gh
+
+FIELDS = ["Open", "High", "Low", "Close", "Volume"]
+
+def bars(start, end, nan=False):
+    index = pd.bdate_range(start, end, inclusive="left")
+    return pd.DataFrame(np.nan if nan else 1.0, index=index, columns=FIELDS)
+
+class FakeDownload:
+    """
+    Stands in for yf.download: per-ticker errors are logged and come back as NaN
+    columns, the way yfinance reports them, instead of raising.
+    errors: {ticker: [error of the 1st call, error of the 2nd call, ...]} (None = rows)
+    """
+    def __init__(self, errors=None, no_rows=()):
+        self.errors = {t: list(e) for t, e in (errors or {}).items()}
+        self.no_rows = set(no_rows)
+        self.calls = []
+
+    def __call__(self, chunk, start=None, end=None, **kw):
+        self.calls.append(list(chunk))
+        failed = {}
+        for t in chunk:
+            pending = self.errors.get(t)
+            if pending and pending[0] is not None:
+                failed[t] = pending.pop(0)
+            elif pending:
+                pending.pop(0)
+        for t in self.no_rows - set(failed):
+            if t in chunk:
+                failed[t] = f"YFPricesMissingError('${t}: possibly delisted; no price data found')"
+        for err in set(failed.values()):
+            yf_utils.get_yf_logger().error(f"{[t for t in chunk if failed.get(t) == err]}: {err}")
+        return pd.concat({t: bars(start, end, nan=t in failed) for t in chunk}, axis=1)
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(gh.time, "sleep", lambda s: None)
+
+def test_logged_ticker_error_is_retried():
+    download = FakeDownload({"BBB": ["YFRateLimitError('Too Many Requests. Rate limited.')"]})
+    history = gh.get_history(["AAA", "BBB", "CCC"], start="2024-01-01", end="2024-03-01", download=download)
+
+    assert set(history.columns.get_level_values(0)) == {"AAA", "BBB", "CCC"}
+    assert history["BBB"].notna().all().all()
+    assert download.calls[1] == ["BBB"]
+
+def test_missing_prices_on_a_long_window_are_retried_then_dropped():
+    download = FakeDownload(no_rows={"DEAD"})
+    history = gh.get_history(["AAA", "DEAD"], start="2024-01-01", end="2024-03-01", download=download)
+
+    assert set(history.columns.get_level_values(0)) == {"AAA"}
+    assert download.calls.count(["DEAD"]) == gh.DOWNLOAD_RETRIES
+
+def test_missing_prices_on_a_short_window_mean_no_new_bars():
+    download = FakeDownload(no_rows={"AAA"})
+    history = gh.get_history(["AAA"], start="2024-03-01", end="2024-03-04", download=download)
+
+    assert history.empty
+    assert download.calls == [["AAA"]]
+
+def test_throttled_ticker_on_a_short_window_is_still_retried():
+    download = FakeDownload({"AAA": ["YFRateLimitError('Too Many Requests. Rate limited.')"]})
+    history = gh.get_history(["AAA"], start="2024-03-01", end="2024-03-05", download=download)
+
+    assert history["AAA"].notna().all().all()
+    assert download.calls == [["AAA"], ["AAA"]]